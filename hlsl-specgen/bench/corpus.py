@@ -0,0 +1,111 @@
+# bench/corpus.py
+# Records the benchmark corpus: synthetic MS Learn pages rebuilt from the
+# committed out/spec.json, in the layout the real pages have (site chrome
+# around a div.content with the tables and lists the extractors read), so the
+# pipeline can be timed and regression-checked without network access.
+#
+#   python -m bench.corpus bench/corpus           # ~145 pages, deterministic
+#   python -m bench.pipeline bench/corpus --write-baseline   # before a change
+#   python -m bench.pipeline bench/corpus --check            # after it
+import argparse
+import html
+import json
+import pathlib
+
+import main as specgen
+from extractors.fixtures import Corpus
+from extractors.variables_mslearn import FAMILY_RE
+
+SPEC = pathlib.Path(__file__).parent.parent / "out" / "spec.json"
+DETAIL = "https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-{}"
+STAGE_TABLES = ("vs_in", "vs_out", "ps_in", "ps_out")
+
+
+def page(body: str, column: str = "column", content: str = "content") -> str:
+    """`body` inside the site chrome every real page carries; `column` and
+    `content` are the class attributes of the divs around it."""
+    nav = "<nav>" + "".join(f"<a href='x{i}'>nav {i}</a>" for i in range(300)) + "</nav>"
+    foot = "<footer>" + "<p>footer text</p>" * 200 + "</footer><script>var x = 1;</script>"
+    return (f"<html><head><title>t</title></head><body>{nav}<div class='{column}'>"
+            f"<div class='{content}'>{body}</div></div>{foot}</body></html>")
+
+
+def table(head, rows) -> str:
+    return ("<table><tr>" + "".join(f"<th>{h}</th>" for h in head) + "</tr>"
+            + "".join("<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in r) + "</tr>"
+                      for r in rows)
+            + "</table>")
+
+
+def _first(description) -> str:
+    if isinstance(description, list):
+        return description[0] if description else ""
+    return description or ""
+
+
+def record(root, spec: dict) -> Corpus:
+    keywords, _, types, variables, functions = specgen.build_extractors()
+    corpus = Corpus(root)
+
+    kinds = {}
+    for kw in spec["keywords"]:
+        kinds.setdefault(kw.get("kind"), []).append(kw["name"])
+    corpus.put(keywords.keywords_url, page(
+        "<h2 id='ms--in-this-article'>In this article</h2><ul>"
+        + "".join(f"<li>{n}</li>" for n in kinds.get("hlsl", [])) + "</ul>"))
+    # multi-class divs, as the live pages use on some layouts
+    corpus.put(keywords.reserved_url, page("<p>" + ", ".join(kinds.get("reserved", [])) + "</p>",
+                                           column="column is-full", content="content is-dense"))
+
+    names = [t["name"] for t in spec["types"]]
+    cut = names.index("string")
+    corpus.put(types.scalars_url, page(
+        "<ul>" + "".join(f"<li>{t['name']} - {html.escape(_first(t.get('description')))}</li>"
+                         for t in spec["types"][:cut]) + "</ul>"
+        + f"<h2>String type</h2><p>{html.escape(_first(spec['types'][cut].get('description')))}</p>"
+        + "<h2>See also</h2><ul><li>other - x</li></ul>"))
+
+    def listed(v):  # families once (as the page spells them), not their expanded copies
+        return bool(FAMILY_RE.match(v["name"])) or not v["name"][-1].isdigit()
+
+    body = ""
+    for stage in STAGE_TABLES:
+        rows = [(v["name"], v["description"], v["type"]) for v in spec["variables"]
+                if stage in v["modifiers"] and listed(v)]
+        body += table(["Input" if stage.endswith("in") else "Output", "Description", "Type"], rows)
+    rows = [(v["name"], v["description"], v["type"]) for v in spec["variables"]
+            if v["name"].startswith("SV_") and listed(v)]
+    body += table(["System-Value Semantic", "Description", "Type"], rows)
+    corpus.put(variables.url, page(body))
+
+    rows = []
+    for f in spec["functions"]:
+        slug = f["name"].lower()
+        rows.append(f"<tr><td><a href='dx-graphics-hlsl-{slug}'>{f['name']}</a></td>"
+                    f"<td>{html.escape(f['description'])}</td>"
+                    f"<td>{f['min_shader_model'].replace('_', '')}</td></tr>")
+        corpus.put(DETAIL.format(slug), page(
+            f"<h2 id='syntax'>Syntax</h2><pre><code>float {f['name']}(\n  in float x,\n"
+            "  out float y[2]\n);</code></pre>"
+            "<h2 id='parameters'>Parameters</h2>"
+            + table(["Item", "Description"], [("x [in]", "The  value.")])
+            + "<h2 id='type-description'>Type Description</h2>"
+            + table(["Name", "Template"], [("x", "scalar")])))
+    corpus.put(functions.url, page(
+        "<table><tr><th>Name</th><th>Description</th><th>Minimum shader model</th></tr>"
+        + "".join(rows) + "</table>"))
+    return corpus
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Record the synthetic benchmark corpus")
+    ap.add_argument("root", help="directory to write the corpus to")
+    ap.add_argument("--spec", type=pathlib.Path, default=SPEC,
+                    help="spec the pages are rebuilt from (default: %(default)s)")
+    args = ap.parse_args()
+    corpus = record(args.root, json.loads(args.spec.read_text(encoding="utf-8")))
+    print(f"[ok] {len(corpus.pages)} pages in {args.root}")
+
+
+if __name__ == "__main__":
+    main()
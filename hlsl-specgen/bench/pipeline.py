@@ -0,0 +1,240 @@
+# bench/pipeline.py
+# Benchmarks every extractor and pipeline stage against a fixture corpus
+# (see extractors/fixtures.py) and compares the result with a baseline.
+# Stages are compared by CPU time relative to a fixed calibration workload
+# measured right before each of them, which evens out machine speed but not
+# every source of noise, so the baseline is not committed: record it with
+# --write-baseline on the machine that runs --check (bench/baseline.json is
+# ignored by git), before the change being measured.
+#
+#   python -m bench.pipeline CORPUS                   # measure, write bench/results.json
+#   python -m bench.pipeline CORPUS --write-baseline  # ...and make it the baseline
+#   python -m bench.pipeline CORPUS --check           # exit 1 on a regression
+#
+# Each stage records the best wall and CPU time over --repeat runs, its CPU
+# time relative to the calibration workload, and the peak traced Python memory
+# of one extra run. Parsing and the whole pipeline (extract, merge, annotate)
+# are measured once per HTML backend, and the backends' spec output must match.
+import argparse
+import copy
+import json
+import pathlib
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import main as specgen
+from extractors import base
+from extractors.base import fetch, to_soup, clear_doc_cache, use_fixtures, set_parser
+from extractors.parsing import BACKENDS, parse
+from extractors.fixtures import Corpus
+from extractors.merge import REPLACE, SpecMerger
+from extractors.scheduler import run_graph, outputs
+from extractors.type_families import expand
+from extractors.types_mslearn import TypesMSLearn
+from extractors.variables_mslearn import VariablesMSLearn
+from emitters import availability, binary_spec, delta, docs, prefix_index, symbols
+
+VERSION = 1
+HERE = pathlib.Path(__file__).parent
+RESULTS = HERE / "results.json"
+BASELINE = HERE / "baseline.json"
+NOISE_FLOOR_SEC = 0.002  # ignore slowdowns smaller than this
+
+
+def calibrate():
+    """A fixed workload none of the repo's code is in: the unit stages are
+    measured in, so results compare across machines. Pure interpreter work,
+    no allocation, so the heap a run has built up does not move it."""
+    h = 0
+    for i in range(300000):
+        h = (h * 31 + i) & 0xFFFFFFFF
+    return h
+
+
+def _timed(fn, repeat: int) -> tuple[float, float]:
+    """Best wall and CPU time of `fn` over `repeat` runs."""
+    wall = cpu = float("inf")
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        wall = min(wall, time.perf_counter() - w0)
+        cpu = min(cpu, time.process_time() - c0)
+    return wall, cpu
+
+
+def measure(fn, repeat: int) -> dict:
+    wall, cpu = _timed(fn, repeat)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "peak_kib": peak // 1024}
+
+
+def relative(r: dict, repeat: int):
+    """Add the calibration time next to `r` and `r`'s CPU time in its units."""
+    unit = _timed(calibrate, repeat)[1]
+    r["calibration_s"] = round(unit, 6)
+    r["relative"] = round(r["cpu_s"] / unit, 4)
+
+
+def stages(corpus: Corpus, tmp: pathlib.Path):
+    """(name, callable) for every measured stage, in pipeline order."""
+    urls = sorted(corpus.pages)
+    pages = {u: fetch(u) for u in urls}
+    extractors = specgen.build_extractors()
+    previous = specgen.load_spec(specgen.OUT)  # the spec a run merges into
+
+    def cold(fn):
+        def run():
+            clear_doc_cache()
+            shutil.rmtree(base.CACHE_DIR, ignore_errors=True)  # per-page signature cache
+            return fn()
+        return run
+
+    yield "fetch", lambda: [fetch(u) for u in urls]
+    for backend in BACKENDS:
+        yield f"parse[{backend}]", lambda b=backend: [parse(pages[u], b) for u in urls]
+
+    for ex in extractors:
+        yield f"extract:{ex.target_key}", cold(ex.run)
+
+    variables = VariablesMSLearn()
+    if variables.url in pages:
+        tables = to_soup(pages[variables.url]).select("div.content table")
+        yield "table_rows", lambda: [variables._rows(t) for t in tables]
+
+    types = TypesMSLearn(compact=True)
+    if types.scalars_url in pages:
+        families = cold(types.run)()["type_families"]
+        yield "type_expansion", lambda: expand(families)
+
+    def extract():
+        data = {}
+        for _, d, _ in run_graph(extractors, lambda ex, deps: outputs(ex, ex.run(**deps))):
+            data.update(d)
+        return data
+
+    def merge(data):
+        # as main.py does with no build manifest: every existing entry was generated
+        spec = copy.deepcopy(previous)
+        merger = SpecMerger(spec, default=REPLACE, sort=specgen.SORTED)
+        for key, value in data.items():
+            if key in specgen.MERGED:
+                merger.merge(key, value, remove=[x.get("name") for x in previous.get(key, [])])
+            else:
+                spec[key] = value
+        return spec
+
+    def pipeline():
+        spec = merge(extract())
+        symbols.annotate(spec)
+        docs.annotate(spec)
+        availability.annotate(spec)
+        return spec
+
+    # every backend must yield byte-identical spec output
+    specs = {}
+    for backend in BACKENDS:
+        set_parser(backend)
+        specs[backend] = json.dumps(cold(pipeline)(), indent=2, ensure_ascii=False)
+        yield f"pipeline[{backend}]", cold(pipeline)
+    set_parser(BACKENDS[0])
+    if len(set(specs.values())) != 1:
+        raise RuntimeError(f"parser backends disagree on spec output: {sorted(specs)}")
+
+    data = cold(extract)()
+    yield "merge", lambda: merge(data)
+
+    spec = cold(pipeline)()
+    yield "annotate:symbols", lambda: symbols.annotate(spec)
+    yield "annotate:docs", lambda: docs.annotate(spec)
+    yield "annotate:availability", lambda: availability.annotate(spec)
+    bits = availability.annotate(spec)
+
+    out = tmp / "spec.json"
+
+    def save():
+        out.unlink(missing_ok=True)
+        specgen.save_spec(out, spec)
+
+    yield "save_spec", save
+    yield "delta", lambda: delta.diff(previous, spec)
+    yield "binary_spec", lambda: binary_spec.encode(spec)
+    yield "prefix_index", lambda: prefix_index.encode(spec)
+    yield "symbols", lambda: symbols.encode(spec)
+    yield "profiles", lambda: availability.encode(spec, bits)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Stages whose relative CPU time grew by more than `tolerance`; a growth
+    worth less than NOISE_FLOOR_SEC at this machine's speed is ignored."""
+    regressions = []
+    for name, now in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before or "relative" not in before:
+            continue
+        limit = before["relative"] * (1 + tolerance)
+        grown = (now["relative"] - before["relative"]) * now["calibration_s"]
+        if now["relative"] > limit and grown > NOISE_FLOOR_SEC:
+            regressions.append(
+                f"{name}: {now['relative']:.2f}x calibration vs baseline "
+                f"{before['relative']:.2f}x (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the spec generation pipeline")
+    ap.add_argument("corpus", help="fixture corpus recorded with main.py --record "
+                                   "or python -m bench.corpus")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", help="run only stages whose name starts with this")
+    ap.add_argument("--out", type=pathlib.Path, default=RESULTS)
+    ap.add_argument("--baseline", type=pathlib.Path, default=BASELINE)
+    ap.add_argument("--write-baseline", action="store_true")
+    ap.add_argument("--check", action="store_true",
+                    help="exit 1 if any stage is slower than the baseline allows")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    args = ap.parse_args()
+
+    use_fixtures(replay=Corpus(args.corpus))
+    results = {"version": VERSION, "python": platform.python_version(),
+               "corpus": str(args.corpus), "stages": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        base.CACHE_DIR = pathlib.Path(tmp) / "cache"  # no warm signature cache
+        for name, fn in stages(Corpus(args.corpus), pathlib.Path(tmp)):
+            if args.only and not name.startswith(args.only):
+                continue
+            r = results["stages"][name] = measure(fn, args.repeat)
+            relative(r, args.repeat)
+            print(f"{name:24} wall {r['wall_s'] * 1e3:9.2f} ms  "
+                  f"cpu {r['cpu_s'] * 1e3:9.2f} ms  {r['relative']:8.2f}x  "
+                  f"peak {r['peak_kib']:8d} KiB")
+
+    text = json.dumps(results, indent=2) + "\n"
+    args.out.write_text(text, encoding="utf-8")
+    if args.write_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"[ok] wrote baseline {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            raise SystemExit(f"no baseline at {args.baseline}")
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")),
+                              args.tolerance)
+        for r in regressions:
+            print(f"[regression] {r}")
+        if regressions:
+            sys.exit(1)
+        print("[ok] no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# bench/prefix_index.py
+# Micro-benchmark: prefix index lookups vs. a linear scan over all names.
+#   python -m bench.prefix_index [out/spec.json]
+import json
+import pathlib
+import sys
+import time
+from emitters.prefix_index import build, PrefixIndex
+
+
+def timeit(fn, queries, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for q in queries:
+            fn(q)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(queries)
+
+
+def main():
+    path = pathlib.Path(sys.argv[1] if len(sys.argv) > 1 else "out/spec.json")
+    spec = json.loads(path.read_text(encoding="utf-8"))
+
+    t0 = time.perf_counter()
+    index = PrefixIndex(build(spec))
+    built = time.perf_counter() - t0
+
+    # every 1-, 2- and 3-character prefix that occurs in the index
+    queries = sorted({k[:n] for k in index.keys for n in (1, 2, 3)})
+
+    def linear(p):
+        return [e for k, e in zip(index.keys, index.entries) if k.startswith(p)]
+
+    for q in queries:
+        if index.query(q) != linear(q):
+            raise RuntimeError(f"index and linear scan disagree on {q!r}")
+
+    fast = timeit(index.query, queries)
+    slow = timeit(linear, queries)
+    print(f"entries: {len(index.entries)}  queries: {len(queries)}  build: {built * 1e3:.1f} ms")
+    print(f"index:   {fast * 1e6:8.2f} us/query")
+    print(f"linear:  {slow * 1e6:8.2f} us/query  ({slow / fast:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
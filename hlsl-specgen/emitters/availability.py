@@ -0,0 +1,163 @@
+# emitters/availability.py
+# Shader-model and stage availability as bitsets, so filtering completions by
+# the active target profile is one AND per item instead of parsing
+# "min_shader_model" strings on every request.
+#
+#   spec["availability"] = {"models": ["1_0", "1_1", ...],   # bit i
+#                           "stages": ["vs", "ps", ...],     # bit len(models) + j
+#                           "profiles": {"ps_5_0": mask, ...}}
+#   entry["availability"] = mask   # functions, types, variables, semantic_index
+#
+# An entry's mask has the bit of every model from its minimum on and of every
+# stage it is valid in; a profile's mask is its model bit | its stage bit.
+# An entry is available in profile p when (entry & p) == p.
+#
+# out/profiles.json lists the members of every profile up front, as half-open
+# [start, end) runs of indices into spec["functions"], expand_types(spec) and
+# spec["variables"] (members are mostly contiguous, so runs stay small):
+#   {"version": 1, "profiles": {"ps_5_0": {"functions": [[0, 139]],
+#                                          "types": [[0, 17], [30, 1547]], ...}}}
+import json
+import re
+
+from extractors.type_families import expand_types
+from extractors.variables_mslearn import STAGES as INDEX_STAGES, find_semantic
+
+VERSION = 1
+
+MODELS = ("1_0", "1_1", "2_0", "3_0", "4_0", "4_1", "5_0", "5_1",
+          "6_0", "6_1", "6_2", "6_3", "6_4", "6_5", "6_6", "6_7", "6_8")
+STAGES = ("vs", "ps", "gs", "hs", "ds", "cs")
+# first model each stage exists in
+STAGE_SINCE = {"vs": "1_0", "ps": "1_0", "gs": "4_0", "hs": "5_0", "ds": "5_0", "cs": "4_0"}
+
+# semantic_index / variable modifiers -> stage
+MODIFIER_STAGES = {"vs_in": "vs", "vs_out": "vs", "ps_in": "ps", "ps_out": "ps"}
+# what the scraped data does not say: explicit 64-bit types need SM 6.0,
+# explicit 16-bit types SM 6.2; system values arrived with SM 4.0
+TYPE_MIN_SM = [(re.compile(r"(?:u?int|float)64_t"), "6_0"),
+               (re.compile(r"(?:u?int|float)16_t"), "6_2")]
+SV_MIN_SM = "4_0"
+IS_SV = re.compile(r"^\s*SV_", re.I)
+
+
+def _sm_key(sm: str):
+    return tuple(int(x) for x in sm.split("_"))
+
+
+class Bits:
+    """Bit assignment for one spec: every known model plus any the data names."""
+
+    def __init__(self, extra_models=()):
+        self.models = sorted(set(MODELS) | {m for m in extra_models if m}, key=_sm_key)
+        self.stages = list(STAGES)
+        if len(self.models) + len(self.stages) > 31:  # stays a non-negative i32
+            raise RuntimeError("too many shader models for a 31-bit availability mask")
+        self.model_bit = {m: 1 << i for i, m in enumerate(self.models)}
+        self.stage_bit = {s: 1 << (len(self.models) + i) for i, s in enumerate(self.stages)}
+        self.all_stages = sum(self.stage_bit.values())
+
+    def mask(self, min_sm: str = "", stages=None) -> int:
+        """Models from `min_sm` on ("" = all) | `stages` (None = all)."""
+        lo = _sm_key(min_sm) if min_sm else (0,)
+        m = sum(b for sm, b in self.model_bit.items() if _sm_key(sm) >= lo)
+        if stages is None:
+            return m | self.all_stages
+        return m | sum(self.stage_bit[s] for s in stages)
+
+    def profiles(self) -> dict[str, int]:
+        """{"vs_1_0": mask, ...} for every stage and every model it exists in."""
+        out = {}
+        for stage in self.stages:
+            since = _sm_key(STAGE_SINCE[stage])
+            for sm in self.models:
+                if _sm_key(sm) >= since:
+                    out[f"{stage}_{sm}"] = self.model_bit[sm] | self.stage_bit[stage]
+        return out
+
+
+def _type_mask(bits: Bits, name: str) -> int:
+    for pattern, sm in TYPE_MIN_SM:
+        if pattern.search(name):
+            return bits.mask(sm)
+    return bits.mask()
+
+
+def _semantic_mask(bits: Bits, name: str, roles) -> int:
+    """`roles`: the vs_in/ps_out/... tables `name` is listed in. A semantic
+    listed in none (for SV_ ones, under "system" alone) gets every stage."""
+    stages = sorted({MODIFIER_STAGES[r] for r in roles if r in MODIFIER_STAGES}) or None
+    if IS_SV.match(name):
+        return bits.mask(SV_MIN_SM, stages=stages)
+    return bits.mask(stages=stages)
+
+
+def _roles(index: dict, name: str) -> list[str]:
+    """The semantic_index stages `name` (or its family) is listed in."""
+    if not index:
+        return []
+    return [s for s in INDEX_STAGES if find_semantic(index, s, name) is not None]
+
+
+def annotate(spec: dict) -> Bits:
+    """Set "availability" on every function, type and semantic, and the
+    spec["availability"] legend; returns the bit assignment used."""
+    bits = Bits(f.get("min_shader_model", "") for f in spec.get("functions", []))
+    for f in spec.get("functions", []):
+        # the intrinsics table names no stages; every stage is assumed
+        f["availability"] = bits.mask(f.get("min_shader_model", ""))
+    for t in spec.get("types", []):
+        t["availability"] = _type_mask(bits, t.get("name", ""))
+    index = spec.get("semantic_index") or {}
+    for v in spec.get("variables", []):
+        # SV_ variables carry no modifiers; their stages are in the index
+        roles = set(v.get("modifiers", [])) | set(_roles(index, v["name"]))
+        v["availability"] = _semantic_mask(bits, v["name"], roles)
+    for sem in index.get("semantics", []):
+        sem["availability"] = _semantic_mask(bits, sem["name"], _roles(index, sem["name"]))
+
+    spec["availability"] = {"models": bits.models, "stages": bits.stages,
+                            "profiles": bits.profiles()}
+    return bits
+
+
+def _runs(indices) -> list[list[int]]:
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return runs
+
+
+def members(runs) -> list[int]:
+    """The indices a profiles.json run list stands for."""
+    return [i for start, end in runs for i in range(start, end)]
+
+
+def build(spec: dict, bits: Bits | None = None) -> dict:
+    """Per-profile member indices (see the header); call after annotate()."""
+    bits = bits or annotate(spec)
+    types = expand_types(spec)
+    masks = {
+        "functions": [f.get("availability", 0) for f in spec.get("functions", [])],
+        # members of compact type families carry no mask of their own
+        "types": [t["availability"] if "availability" in t else _type_mask(bits, t["name"])
+                  for t in types],
+        "variables": [v.get("availability", 0) for v in spec.get("variables", [])],
+    }
+    return {"version": VERSION, "profiles": {
+        profile: {cat: _runs(i for i, m in enumerate(ms) if m & p == p)
+                  for cat, ms in masks.items()}
+        for profile, p in bits.profiles().items()
+    }}
+
+
+def encode(spec: dict, bits: Bits | None = None) -> bytes:
+    """build() as compact JSON (what main.py writes to out/profiles.json)."""
+    return json.dumps(build(spec, bits), separators=(",", ":")).encode("utf-8")
+
+
+def available(mask: int, profile_mask: int) -> bool:
+    return mask & profile_mask == profile_mask
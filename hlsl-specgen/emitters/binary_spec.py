@@ -0,0 +1,295 @@
+# emitters/binary_spec.py
+# Compact, versioned binary encoding of spec.json ("HLSB").
+#
+# Layout (all integers little-endian):
+#   header   magic "HLSB", u16 version, u16 table count,
+#            u32 string count, u32 pool length (in u32 words),
+#            u32 offsets of the string, pool and table sections
+#   strings  u32 offsets[count + 1] into the UTF-8 blob that follows;
+#            every name and description is interned once
+#   pool     u32 words; list cells point here as [len, item, item, ...]
+#   tables   per table: u32 name, u16 field count, u16 0, u32 row count,
+#            fields as (u32 name, u8 kind, 3 pad), then row count x field
+#            count u32 cells
+#
+# The spec itself is the single row of table "spec"; a list of objects under
+# field `f` of table T becomes table "f" (or "T.f" below the root). Keys are
+# taken in stream_json's canonical order, so equal specs encode identically.
+#
+# Cells: a string id, i32, bool, f32 bit pattern, row index, or pool offset
+# (lists as [len, item, ...], f64 as two words, low first). A missing field
+# is ABSENT and a JSON null NULL (INT_ABSENT / INT_NULL in int columns); a
+# field that is null in every row has kind "null".
+import struct
+
+from .stream_json import canonical
+
+MAGIC = b"HLSB"
+VERSION = 2
+
+ABSENT = 0xFFFFFFFF
+NULL = 0xFFFFFFFE
+INT_ABSENT = 0x80000000  # int cells are i32; INT32_MIN marks a missing value
+INT_NULL = 0x80000001    # ... and INT32_MIN + 1 a null one
+
+STR, INT, BOOL, STRS, ROWS, ROW, INTS, NONE, F32, F64 = range(10)
+KIND_NAMES = ["str", "int", "bool", "str[]", "rows", "row", "int[]", "null", "f32", "f64"]
+_MISSING = object()  # a field a row does not have (as opposed to a null one)
+
+_HEADER = struct.Struct("<4sHHIIIII")
+_TABLE = struct.Struct("<IHHI")
+_FIELD = struct.Struct("<IB3x")
+_F32 = struct.Struct("<f")
+
+
+# ---------- encoding ----------
+
+class _Encoder:
+    def __init__(self):
+        self.strings: dict[str, int] = {}
+        self.pool: list[int] = []
+        self.tables: dict[str, list[dict]] = {}
+
+    def sid(self, s: str) -> int:
+        i = self.strings.get(s)
+        if i is None:
+            i = self.strings[s] = len(self.strings)
+        return i
+
+    def add_row(self, table: str, obj: dict) -> int:
+        """Queue `obj` as a row of `table`, hoisting nested objects into subtables."""
+        rows = self.tables.setdefault(table, [])
+        row = {}
+        for k, v in obj.items():
+            sub = k if table == "spec" else f"{table}.{k}"
+            if isinstance(v, dict):
+                row[k] = (ROW, self.add_row(sub, v))
+            elif isinstance(v, list) and v and all(isinstance(x, dict) for x in v):
+                row[k] = (ROWS, [self.add_row(sub, x) for x in v])
+            else:
+                row[k] = v
+        rows.append(row)
+        return len(rows) - 1
+
+    def kind_of(self, table: str, field: str, values) -> int:
+        present = [v for v in values if v is not _MISSING and v is not None]
+        if not present:
+            return NONE
+        kinds = {_kind(v) for v in present}
+        empty = "empty" in kinds  # empty lists fit any list kind
+        kinds.discard("empty")
+        if len(kinds) > 1 or (empty and kinds - {STRS, INTS, ROWS}):
+            names = sorted(KIND_NAMES[k] for k in kinds) + (["[]"] if empty else [])
+            raise RuntimeError(f"{table}.{field}: mixed value kinds {names}")
+        kind = kinds.pop() if kinds else STRS
+        if kind == F64 and all(_fits_f32(v) for v in present):
+            kind = F32  # every value survives the narrowing: store it inline
+        return kind
+
+    def cell(self, kind: int, v) -> int:
+        if v is _MISSING:
+            return INT_ABSENT if kind == INT else ABSENT
+        if v is None:
+            return INT_NULL if kind == INT else NULL
+        if kind == STR:
+            return self.sid(v)
+        if kind == INT:
+            if not -0x7FFFFFFE <= v <= 0x7FFFFFFF:
+                raise RuntimeError(f"integer {v} does not fit in i32")
+            return v & 0xFFFFFFFF
+        if kind == BOOL:
+            return int(v)
+        if kind == F32:
+            return struct.unpack("<I", _F32.pack(v))[0]
+        if kind == F64:
+            off = len(self.pool)
+            self.pool.extend(struct.unpack("<II", struct.pack("<d", v)))
+            return off
+        if kind == ROW:
+            return v[1]
+        items = v[1] if isinstance(v, tuple) else v
+        if kind == STRS:
+            items = [self.sid(x) for x in items]
+        elif kind == INTS:
+            items = [self.cell(INT, x) for x in items]
+        off = len(self.pool)
+        self.pool.append(len(items))
+        self.pool.extend(items)
+        return off
+
+    def encode(self, spec: dict) -> bytes:
+        self.add_row("spec", spec)
+
+        tables = []
+        for name, rows in self.tables.items():
+            fields = list(dict.fromkeys(k for r in rows for k in r))
+            kinds = [self.kind_of(name, f, [r.get(f, _MISSING) for r in rows]) for f in fields]
+            cells = [self.cell(k, r.get(f, _MISSING)) for r in rows for f, k in zip(fields, kinds)]
+            head = _TABLE.pack(self.sid(name), len(fields), 0, len(rows))
+            head += b"".join(_FIELD.pack(self.sid(f), k) for f, k in zip(fields, kinds))
+            tables.append(head + struct.pack(f"<{len(cells)}I", *cells))
+
+        blobs = [s.encode("utf-8") for s in self.strings]
+        offsets = [0]
+        for b in blobs:
+            offsets.append(offsets[-1] + len(b))
+        strings = struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+        strings += b"\0" * (-len(strings) % 4)  # keep the pool u32-aligned
+        pool = struct.pack(f"<{len(self.pool)}I", *self.pool)
+
+        s_off = _HEADER.size
+        p_off = s_off + len(strings)
+        t_off = p_off + len(pool)
+        header = _HEADER.pack(MAGIC, VERSION, len(tables), len(blobs),
+                              len(self.pool), s_off, p_off, t_off)
+        return header + strings + pool + b"".join(tables)
+
+
+def _kind(v):
+    if isinstance(v, tuple):
+        return v[0]
+    if isinstance(v, bool):
+        return BOOL
+    if isinstance(v, int):
+        return INT
+    if isinstance(v, float):
+        if v != v or v in (float("inf"), float("-inf")):
+            raise RuntimeError(f"cannot encode value {v!r}")  # not JSON either
+        return F64
+    if isinstance(v, str):
+        return STR
+    if isinstance(v, list):
+        if not v:
+            return "empty"
+        if all(isinstance(x, str) for x in v):
+            return STRS
+        if all(isinstance(x, int) and not isinstance(x, bool) for x in v):
+            return INTS
+    raise RuntimeError(f"cannot encode value {v!r}")
+
+
+def _fits_f32(v: float) -> bool:
+    try:
+        return _F32.unpack(_F32.pack(v))[0] == v
+    except OverflowError:
+        return False
+
+
+def encode(spec: dict) -> bytes:
+    return _Encoder().encode(canonical(spec))
+
+
+# ---------- decoding ----------
+
+class Table:
+    """One table of a BinarySpec; rows decode lazily."""
+
+    def __init__(self, spec: "BinarySpec", name: str, fields, rows: int, cells: int):
+        self.spec = spec
+        self.name = name
+        self.fields = fields  # [(name, kind)]
+        self.rows = rows
+        self._cells = cells   # byte offset of the first cell
+
+    def __len__(self):
+        return self.rows
+
+    def cell(self, row: int, col: int) -> int:
+        off = self._cells + 4 * (row * len(self.fields) + col)
+        return struct.unpack_from("<I", self.spec.data, off)[0]
+
+    def row(self, i: int) -> dict:
+        out = {}
+        for col, (field, kind) in enumerate(self.fields):
+            v = self.spec.value(self, field, kind, self.cell(i, col))
+            if v is not _MISSING:
+                out[field] = v
+        return out
+
+    def __iter__(self):
+        return (self.row(i) for i in range(self.rows))
+
+
+class BinarySpec:
+    """Reader over an encoded spec; strings and rows are decoded on demand."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        (magic, version, ntables, self.nstrings, npool,
+         self._s_off, self._p_off, t_off) = _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise RuntimeError("not an HLSB spec file")
+        if version != VERSION:
+            raise RuntimeError(f"unsupported HLSB version {version}")
+        self._blob = self._s_off + 4 * (self.nstrings + 1)
+        self._strings: dict[int, str] = {}
+
+        self.tables: dict[str, Table] = {}
+        off = t_off
+        for _ in range(ntables):
+            name, nfields, _, nrows = _TABLE.unpack_from(self.data, off)
+            off += _TABLE.size
+            fields = []
+            for _ in range(nfields):
+                fname, kind = _FIELD.unpack_from(self.data, off)
+                fields.append((self.string(fname), kind))
+                off += _FIELD.size
+            t = Table(self, self.string(name), fields, nrows, off)
+            self.tables[t.name] = t
+            off += 4 * nfields * nrows
+
+    def string(self, i: int) -> str:
+        s = self._strings.get(i)
+        if s is None:
+            a, b = struct.unpack_from("<II", self.data, self._s_off + 4 * i)
+            s = self._strings[i] = bytes(self.data[self._blob + a:self._blob + b]).decode("utf-8")
+        return s
+
+    def _list(self, off: int) -> tuple:
+        n = struct.unpack_from("<I", self.data, self._p_off + 4 * off)[0]
+        return struct.unpack_from(f"<{n}I", self.data, self._p_off + 4 * (off + 1))
+
+    def value(self, table: Table, field: str, kind: int, c: int):
+        """The decoded cell; a missing field decodes to the module's _MISSING."""
+        if c == (INT_ABSENT if kind == INT else ABSENT):
+            return _MISSING
+        if c == (INT_NULL if kind == INT else NULL) or kind == NONE:
+            return None
+        sub = field if table.name == "spec" else f"{table.name}.{field}"
+        if kind == STR:
+            return self.string(c)
+        if kind == INT:
+            return c - (1 << 32) if c & 0x80000000 else c
+        if kind == BOOL:
+            return bool(c)
+        if kind == F32:
+            return _F32.unpack(struct.pack("<I", c))[0]
+        if kind == F64:
+            return struct.unpack_from("<d", self.data, self._p_off + 4 * c)[0]
+        if kind == ROW:
+            return self.tables[sub].row(c)
+        items = self._list(c)
+        if kind == STRS:
+            return [self.string(x) for x in items]
+        if kind == INTS:
+            return [x - (1 << 32) if x & 0x80000000 else x for x in items]
+        return [self.tables[sub].row(x) for x in items]
+
+    def category(self, key: str) -> Table:
+        return self.tables[key]
+
+    def to_dict(self) -> dict:
+        return self.tables["spec"].row(0)
+
+
+def load(path) -> BinarySpec:
+    with open(path, "rb") as f:
+        return BinarySpec(f.read())
+
+
+def verify_roundtrip(spec: dict, data: bytes):
+    """Raise if `data` does not decode back to exactly `spec`."""
+    back = BinarySpec(data).to_dict()
+    if back != spec:
+        bad = sorted(k for k in set(spec) | set(back) if spec.get(k) != back.get(k))
+        raise RuntimeError(f"binary spec round-trip mismatch in {bad}")
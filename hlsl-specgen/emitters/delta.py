@@ -0,0 +1,190 @@
+# emitters/delta.py
+# Structured deltas between spec generations, chained by content hash.
+#
+#   {"version": 1,
+#    "base": sha256 of the previous spec, "result": sha256 of the new one,
+#    "previous": sha256 of the previous delta file (null for the first),
+#    "categories": {"functions": {"added": [{"index": i, "entry": {...}}],
+#                                 "removed": ["name", ...],
+#                                 "changed": [{"name": n, "set": {field: value},
+#                                              "unset": [field, ...]}]}},
+#    "replaced": {key: new value}, "dropped": [key, ...]}
+#
+# Hashes are over the canonical bytes stream_json.write_spec() writes, so a
+# delta applies to exactly one spec and apply() can prove it produced the
+# next one. Named-entry lists are diffed by name; anything else (and a list
+# whose surviving entries were reordered) is replaced whole.
+#
+#   out/deltas/000001-<result[:12]>.json   one file per generation that changed
+#   out/deltas/index.json                  {"version": 1, "deltas": [{"file",
+#                                           "base", "result", "sha256"}, ...]}
+import argparse
+import copy
+import hashlib
+import json
+import pathlib
+
+from .stream_json import spec_sha256, write_spec
+
+VERSION = 1
+INDEX = "index.json"
+_MISSING = object()
+
+
+def _named(value) -> bool:
+    """A list of distinctly named entries (diffable by name)."""
+    if not isinstance(value, list):
+        return False
+    names = [x.get("name") if isinstance(x, dict) else None for x in value]
+    return all(names) and len(set(names)) == len(names)
+
+
+def _diff_list(old: list, new: list) -> dict | None:
+    """Per-name changes from `old` to `new`, or None if order changed."""
+    old_by = {x["name"]: x for x in old}
+    new_names = {x["name"] for x in new}
+    kept_old = [x["name"] for x in old if x["name"] in new_names]
+    kept_new = [x["name"] for x in new if x["name"] in old_by]
+    if kept_old != kept_new:
+        return None
+
+    added, changed = [], []
+    for i, x in enumerate(new):
+        cur = old_by.get(x["name"])
+        if cur is None:
+            added.append({"index": i, "entry": x})
+        elif cur != x:
+            change = {"name": x["name"],
+                      "set": {k: v for k, v in x.items() if cur.get(k, _MISSING) != v},
+                      "unset": sorted(k for k in cur if k not in x)}
+            changed.append(change)
+    removed = [x["name"] for x in old if x["name"] not in new_names]
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff(old: dict, new: dict, previous: str | None = None) -> dict:
+    """The delta that turns spec `old` into spec `new`."""
+    categories, replaced = {}, {}
+    for key, value in new.items():
+        before = old.get(key, _MISSING)
+        if before == value:
+            continue
+        d = _diff_list(before, value) if _named(before) and _named(value) else None
+        if d is None:
+            replaced[key] = value
+        elif d["added"] or d["removed"] or d["changed"]:
+            categories[key] = d
+    return {
+        "version": VERSION,
+        "base": spec_sha256(old),
+        "result": spec_sha256(new),
+        "previous": previous,
+        "categories": categories,
+        "replaced": replaced,
+        "dropped": sorted(k for k in old if k not in new),
+    }
+
+
+def apply(spec: dict, delta: dict, verify: bool = True) -> dict:
+    """A new spec: `spec` with `delta` applied. With `verify`, both ends must
+    match the delta's hashes."""
+    if delta.get("version") != VERSION:
+        raise RuntimeError(f"unsupported delta version {delta.get('version')!r}")
+    if verify and spec_sha256(spec) != delta["base"]:
+        raise RuntimeError("delta does not apply: base hash mismatch")
+    out = copy.deepcopy(spec)
+    for key in delta["dropped"]:
+        out.pop(key, None)
+    for key, d in delta["categories"].items():
+        gone = set(d["removed"])
+        entries = [x for x in out.get(key, []) if x["name"] not in gone]
+        by_name = {x["name"]: x for x in entries}
+        for change in d["changed"]:
+            x = by_name[change["name"]]
+            for k in change["unset"]:
+                x.pop(k, None)
+            x.update(copy.deepcopy(change["set"]))
+        for add in d["added"]:  # ascending indices: each lands at its final position
+            entries.insert(add["index"], copy.deepcopy(add["entry"]))
+        out[key] = entries
+    for key, value in delta["replaced"].items():
+        out[key] = copy.deepcopy(value)
+    if verify and spec_sha256(out) != delta["result"]:
+        raise RuntimeError("delta applied but the result hash does not match")
+    return out
+
+
+def load_index(root: pathlib.Path) -> dict:
+    try:
+        return json.loads((pathlib.Path(root) / INDEX).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": VERSION, "deltas": []}
+
+
+def write_delta(root: pathlib.Path, old: dict, new: dict) -> pathlib.Path | None:
+    """Record the delta from `old` to `new` under `root` and extend the chain;
+    returns its path, or None when the spec did not change."""
+    root = pathlib.Path(root)
+    index = load_index(root)
+    chain = index["deltas"]
+    delta = diff(old, new, previous=chain[-1]["sha256"] if chain else None)
+    if delta["base"] == delta["result"]:
+        return None
+    path = root / f"{len(chain) + 1:06d}-{delta['result'][:12]}.json"
+    write_spec(path, delta)
+    chain.append({"file": path.name, "base": delta["base"], "result": delta["result"],
+                  "sha256": hashlib.sha256(path.read_bytes()).hexdigest()})
+    write_spec(root / INDEX, index)
+    return path
+
+
+def replay(root: pathlib.Path, spec: dict) -> dict:
+    """`spec` brought forward through every delta in `root` that follows it,
+    checking the chain links on the way."""
+    root = pathlib.Path(root)
+    chain = load_index(root)["deltas"]
+    start = spec_sha256(spec)
+    if not chain or chain[-1]["result"] == start:
+        return spec  # already current
+    i = next((i for i, d in enumerate(chain) if d["base"] == start), None)
+    if i is None:
+        raise RuntimeError(f"no delta in {root} starts from this spec")
+    previous = chain[i - 1]["sha256"] if i else None
+    for entry in chain[i:]:
+        data = (root / entry["file"]).read_bytes()
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise RuntimeError(f"{entry['file']} does not match its index hash")
+        delta = json.loads(data)
+        if delta["previous"] != previous:
+            raise RuntimeError(f"{entry['file']} breaks the delta chain")
+        spec = apply(spec, delta)
+        previous = entry["sha256"]
+    return spec
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or apply spec deltas")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("log", help="list the delta chain")
+    p.add_argument("root")
+    p = sub.add_parser("apply", help="bring a spec forward through a delta chain")
+    p.add_argument("root")
+    p.add_argument("spec")
+    p.add_argument("-o", "--out", required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "log":
+        for entry in load_index(args.root)["deltas"]:
+            delta = json.loads((pathlib.Path(args.root) / entry["file"]).read_text(encoding="utf-8"))
+            counts = ", ".join(
+                f"{key} +{len(d['added'])} -{len(d['removed'])} ~{len(d['changed'])}"
+                for key, d in delta["categories"].items())
+            replaced = ", ".join(delta["replaced"])
+            print(f"{entry['file']}  {counts or '-'}" + (f"  replaced: {replaced}" if replaced else ""))
+    else:
+        spec = json.loads(pathlib.Path(args.spec).read_text(encoding="utf-8"))
+        write_spec(pathlib.Path(args.out), replay(args.root, spec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# emitters/docs.py
+# Hover/completion text rendered once at generation time, so the language
+# server serves prebuilt strings instead of formatting every entry at startup.
+# Mirrors builtinCompletions / itemDocumentation / write*Signature in
+# src/Workspace.zig; keep the two in step.
+from extractors.variables_mslearn import STAGES
+
+KEYWORD_DOCS = {
+    "hlsl": "Available in standard HLSL.",
+    "reserved": "Reserved for future use.",
+}
+
+
+def _paragraphs(description) -> list[str]:
+    if not description:
+        return []
+    return [description] if isinstance(description, str) else list(description)
+
+
+def item_documentation(item: dict) -> str:
+    """Markdown for a variable or function: every paragraph followed by a blank line."""
+    return "".join(p + "\n\n" for p in _paragraphs(item.get("description")))
+
+
+def _modifiers(mods) -> str:
+    return " ".join(mods) if isinstance(mods, list) else (mods or "")
+
+
+def variable_signature(var: dict, names: bool) -> str:
+    """`[modifiers ]type` or, with names, `[modifiers ]type name[ = default];`.
+    Stage roles (vs_in, ps_out, ...) are not HLSL and stay out of it."""
+    mods = _modifiers([m for m in var.get("modifiers") or [] if m not in STAGES])
+    out = (mods + " " if mods else "") + var.get("type", "")
+    if names:
+        out += " " + var["name"]
+        if var.get("default_value"):
+            out += " = " + var["default_value"]
+        out += ";"
+    return out
+
+
+def function_signature(fn: dict, names: bool) -> str:
+    """`ret [name](type, [optional], ...)`; with names an array suffix such as
+    `[2]` moves after the parameter name, as in C."""
+    params = []
+    for p in fn.get("parameters", []):
+        mods = _modifiers(p.get("modifiers"))
+        typ = p.get("type", "")
+        if names:
+            cut = typ.find("[")
+            cut = len(typ) if cut < 0 else cut
+            typ = f"{typ[:cut]} {p.get('name', '')}{typ[cut:]}"
+        s = (mods + " " if mods else "") + typ
+        params.append(f"[{s}]" if p.get("optional") else s)
+    name = fn["name"] if names else ""
+    return f"{fn.get('return_type', '')} {name}({', '.join(params)})"
+
+
+def annotate(spec: dict):
+    """Add "documentation" to types, keywords, variables and functions, and
+    "signature" (anonymous) / "signature_named" to variables and functions.
+
+    Every type gets documentation (its paragraphs joined by blank lines), so
+    the server never builds it. Members of compact type families stay
+    templates and get none; the server renders those after expanding them.
+    """
+    for t in spec.get("types", []):
+        t["documentation"] = "\n\n".join(_paragraphs(t.get("description")))
+    for kw in spec.get("keywords", []):
+        doc = KEYWORD_DOCS.get(kw.get("kind"))
+        if doc is None:
+            kw.pop("documentation", None)
+        else:
+            kw["documentation"] = doc
+    for var in spec.get("variables", []):
+        var["signature"] = variable_signature(var, names=False)
+        var["signature_named"] = variable_signature(var, names=True)
+        var["documentation"] = item_documentation(var)
+    for fn in spec.get("functions", []):
+        fn["signature"] = function_signature(fn, names=False)
+        fn["signature_named"] = function_signature(fn, names=True)
+        fn["documentation"] = item_documentation(fn)
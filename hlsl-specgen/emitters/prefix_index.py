@@ -0,0 +1,70 @@
+# emitters/prefix_index.py
+# Sorted, bucketed prefix index over every completable name in the spec.
+#
+#   {"version": 1,
+#    "entries": [[name, category], ...],   # sorted by casefolded name
+#    "buckets": {"a": [start, end], ...}}  # entry range per first character
+#
+# A prefix query is a bucket lookup plus a binary search: O(log n + k).
+import bisect
+import json
+import pathlib
+from .symbols import categorized
+
+VERSION = 1
+
+
+def build(spec: dict) -> dict:
+    entries = set()
+    for category, it in categorized(spec):
+        if it.get("name"):
+            entries.add((it["name"], category))
+    ordered = sorted(entries, key=lambda e: (e[0].casefold(), e[0], e[1]))
+
+    buckets = {}
+    for i, (name, _) in enumerate(ordered):
+        c = name[0].casefold()
+        if c in buckets:
+            buckets[c][1] = i + 1
+        else:
+            buckets[c] = [i, i + 1]
+
+    return {"version": VERSION, "entries": [list(e) for e in ordered], "buckets": buckets}
+
+
+def encode(spec: dict) -> bytes:
+    """Serialized index for `spec` (compact JSON, stable bytes)."""
+    return (json.dumps(build(spec), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class PrefixIndex:
+    """Case-insensitive prefix lookups over a built index."""
+
+    def __init__(self, index: dict):
+        if index.get("version") != VERSION:
+            raise RuntimeError(f"unsupported prefix index version {index.get('version')}")
+        self.entries = [tuple(e) for e in index["entries"]]
+        self.keys = [name.casefold() for name, _ in self.entries]
+        self.buckets = {c: tuple(r) for c, r in index["buckets"].items()}
+
+    @classmethod
+    def load(cls, path) -> "PrefixIndex":
+        return cls(json.loads(pathlib.Path(path).read_text(encoding="utf-8")))
+
+    def query(self, prefix: str, category: str | None = None, limit: int | None = None):
+        """[(name, category)] whose name starts with `prefix`, ignoring case."""
+        p = prefix.casefold()
+        if p:
+            lo, hi = self.buckets.get(p[0], (0, 0))
+            i = bisect.bisect_left(self.keys, p, lo, hi)
+        else:
+            i, hi = 0, len(self.keys)
+
+        out = []
+        while i < hi and self.keys[i].startswith(p):
+            if category is None or self.entries[i][1] == category:
+                out.append(self.entries[i])
+                if limit is not None and len(out) >= limit:
+                    break
+            i += 1
+        return out
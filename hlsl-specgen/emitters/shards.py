@@ -0,0 +1,69 @@
+# emitters/shards.py
+# Sharded spec output: one file per category plus a manifest.
+#
+#   out/spec/manifest.json   {"schema_version": 1, "meta": {"comment": ...},
+#                             "shards": {"types": {"file": "types.json",
+#                                                  "count": 1547, "sha256": "..."}}}
+#   out/spec/types.json      {"types": [...]}
+#
+# Consumers load only the shards they need; each shard is rewritten only
+# when its own bytes change, so one extractor's update leaves the others'
+# files (and anything built from them) untouched.
+import json
+import pathlib
+from .stream_json import write_spec, file_sha256
+
+SCHEMA_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def write_shards(root: pathlib.Path, spec: dict) -> list[str]:
+    """Write one shard per list/dict category of `spec`; returns the keys rewritten."""
+    root = pathlib.Path(root)
+    meta, shards, changed = {}, {}, []
+    for key, value in spec.items():
+        if not isinstance(value, (list, dict)):
+            meta[key] = value
+            continue
+        path = root / f"{key}.json"
+        if write_spec(path, {key: value}):
+            changed.append(key)
+        shards[key] = {"file": path.name, "count": len(value), "sha256": file_sha256(path)}
+
+    # categories that disappeared from the spec
+    for stale in root.glob("*.json"):
+        if stale.name != MANIFEST and stale.stem not in shards:
+            stale.unlink()
+
+    write_spec(root / MANIFEST, {"schema_version": SCHEMA_VERSION, "meta": meta,
+                                 "shards": shards})
+    return changed
+
+
+def load_manifest(root: pathlib.Path) -> dict:
+    manifest = json.loads((pathlib.Path(root) / MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("schema_version") != SCHEMA_VERSION:
+        raise RuntimeError(f"unsupported shard schema version {manifest.get('schema_version')}")
+    return manifest
+
+
+def load_shard(root: pathlib.Path, key: str, manifest: dict | None = None, verify: bool = True):
+    """The value of one category, read from its shard alone."""
+    root = pathlib.Path(root)
+    manifest = manifest or load_manifest(root)
+    entry = manifest["shards"].get(key)
+    if entry is None:
+        raise RuntimeError(f"no shard for {key!r} in {root / MANIFEST}")
+    path = root / entry["file"]
+    if verify and file_sha256(path) != entry["sha256"]:
+        raise RuntimeError(f"{path} does not match its manifest hash")
+    return json.loads(path.read_text(encoding="utf-8"))[key]
+
+
+def load(root: pathlib.Path, keys=None, verify: bool = True) -> dict:
+    """Reassemble a spec (or just `keys` of it) from its shards."""
+    manifest = load_manifest(root)
+    spec = dict(manifest["meta"])
+    for key in keys if keys is not None else manifest["shards"]:
+        spec[key] = load_shard(root, key, manifest, verify)
+    return spec
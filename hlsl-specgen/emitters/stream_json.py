@@ -0,0 +1,111 @@
+# emitters/stream_json.py
+# Streaming, atomic writer for spec-shaped JSON.
+#
+# Output is byte-for-byte what json.dumps(spec, indent=2, ensure_ascii=False)
+# would give for the canonically ordered spec, but items are serialized a
+# bounded batch at a time, and category values may be generators. The file is
+# built in a temp file next to `path` and renamed over it, so readers never
+# see a half-written spec; an unchanged result leaves `path` untouched.
+import hashlib
+import itertools
+import json
+import os
+import pathlib
+import tempfile
+
+from extractors.cache_store import FILE_MODE
+
+# canonical key order: these first (in this order), everything else sorted
+KEY_ORDER = [
+    # top level
+    "comment", "keywords", "types", "type_families", "functions", "semantics",
+    "operators", "variables", "semantic_index", "availability",
+    # entries
+    "name", "precedence", "left_to_right", "kind", "type", "modifiers", "optional",
+    "description", "min_shader_model", "availability", "return_type", "parameters",
+    "signature", "signature_named", "documentation",
+]
+_RANK = {k: i for i, k in enumerate(KEY_ORDER)}
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+BATCH = 256  # items per encoder call; bounds memory, amortizes encoder setup
+
+
+def canonical(obj):
+    """`obj` with every dict's keys in canonical order."""
+    if isinstance(obj, dict):
+        keys = sorted(obj, key=lambda k: (_RANK.get(k, len(_RANK)), k))
+        return {k: canonical(obj[k]) for k in keys}
+    if isinstance(obj, list):
+        return [canonical(v) for v in obj]
+    return obj
+
+
+def _dumps(value, depth: int) -> str:
+    text = _ENCODER.encode(canonical(value))
+    return text.replace("\n", "\n" + "  " * depth)
+
+
+def iter_chunks(spec: dict):
+    """Text chunks of the serialized spec, one item at a time."""
+    keys = sorted(spec, key=lambda k: (_RANK.get(k, len(_RANK)), k))
+    if not keys:
+        yield "{}\n"
+        return
+    yield "{"
+    for i, key in enumerate(keys):
+        yield ("," if i else "") + "\n  " + json.dumps(key, ensure_ascii=False) + ": "
+        value = spec[key]
+        if isinstance(value, dict) or isinstance(value, (str, int, float, bool)) or value is None:
+            yield _dumps(value, 1)
+            continue
+        items, first = iter(value), True
+        while batch := list(itertools.islice(items, BATCH)):
+            # "[\n  a,\n  b\n]" -> "\n    a,\n    b" at the category's depth
+            text = _ENCODER.encode([canonical(it) for it in batch])
+            yield ("[" if first else ",") + text[1:-2].replace("\n", "\n  ")
+            first = False
+        yield "[]" if first else "\n  ]"
+    yield "\n}\n"
+
+
+def spec_sha256(spec: dict) -> str:
+    """sha256 of the bytes write_spec() would write for `spec`."""
+    h = hashlib.sha256()
+    for chunk in iter_chunks(spec):
+        h.update(chunk.encode("utf-8"))
+    return h.hexdigest()
+
+
+def file_sha256(path: pathlib.Path) -> str | None:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    h = hashlib.sha256()
+    with f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_spec(path: pathlib.Path, spec: dict) -> bool:
+    """Stream `spec` to `path` atomically; returns whether the file changed."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    h = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter_chunks(spec):
+                data = chunk.encode("utf-8")
+                h.update(data)
+                f.write(data)
+        if file_sha256(path) == h.hexdigest():
+            os.unlink(tmp)
+            return False
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+        return True
+    except BaseException:
+        pathlib.Path(tmp).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,62 @@
+# emitters/symbols.py
+# Cross-category name resolution done once at generation time, so consumers
+# never have to reconcile keywords against types themselves.
+#
+# The keyword -> type tags go into spec.json; the symbol table is its own
+# artifact (out/symbols.json), so the embedded spec does not carry every name
+# a second time:
+#   {"version": 1, "symbols": [{"name": "bool", "categories": ["keyword", "type"]}, ...]}
+import json
+
+from extractors.type_families import expand_types
+
+VERSION = 1
+
+# spec key -> category name used in the symbol table and the prefix index
+CATEGORIES = {
+    "types": "type",
+    "keywords": "keyword",
+    "functions": "function",
+    "variables": "variable",
+}
+
+
+def categorized(spec: dict):
+    """(category, entry) for every entry in CATEGORIES, members of compact
+    type families included."""
+    for key, category in CATEGORIES.items():
+        for it in expand_types(spec) if key == "types" else spec.get(key, []):
+            yield category, it
+
+
+def annotate(spec: dict):
+    """Tag keywords with the type they alias.
+
+    A keyword whose name is also a type (`bool`, `vector`, `Texture2D`, ...)
+    gets `"type": <name>`. Drops the spec["symbols"] older generators embedded.
+    """
+    type_names = {t["name"] for t in expand_types(spec) if t.get("name")}
+    for kw in spec.get("keywords", []):
+        kw.pop("type", None)
+        if kw.get("name") in type_names:
+            kw["type"] = kw["name"]
+    spec.pop("symbols", None)
+
+
+def build(spec: dict) -> dict:
+    """Every distinct name once with the sorted categories it appears in."""
+    seen: dict[str, set] = {}
+    for category, it in categorized(spec):
+        name = " ".join(str(it.get("name", "")).split())
+        if name:
+            seen.setdefault(name, set()).add(category)
+
+    return {"version": VERSION, "symbols": [
+        {"name": name, "categories": sorted(cats)}
+        for name, cats in sorted(seen.items(), key=lambda kv: (kv[0].lower(), kv[0]))
+    ]}
+
+
+def encode(spec: dict) -> bytes:
+    """build() as compact JSON (what main.py writes to out/symbols.json)."""
+    return (json.dumps(build(spec), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
@@ -1,45 +1,359 @@
 import pathlib
 import time
 import hashlib
+import importlib.util
+import inspect
 import json
-import requests
-from bs4 import BeautifulSoup
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from . import metrics, parsing
+from .cache_store import CacheStore, DEFAULT_BUDGET, atomic_write
+from .merge import SpecMerger, KEEP
+from .parsing import Region
 
 CACHE_DIR = pathlib.Path("cache")
+CACHE_BUDGET = DEFAULT_BUDGET  # bytes of compressed pages kept before LRU eviction
 UA = {"User-Agent": "hlsl-specgen/0.1 (+python requests)"}
 
+# fetch engine knobs: total workers, concurrent requests per host, retries
+MAX_WORKERS = 8
+PER_HOST = 4
+RETRIES = 3
+BACKOFF_SEC = 0.5  # doubled after every failed attempt
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# parsed pages kept per run; LRU-evicted beyond this many documents
+DOC_CACHE_SIZE = 32
+
+_lock = threading.Lock()
+_session = None
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_store = None     # CacheStore, see cache_store()
+_fixtures = None  # Corpus every fetch is served from (replay mode)
+_recorder = None  # Corpus every fetched page is copied into (record mode)
+_origin = None    # scheme://host that requests go to instead of the real one
+_parser = "lxml"  # HTML backend used by to_soup(); see extractors/parsing.py
+_docs: OrderedDict[tuple, object] = OrderedDict()  # (url, region) -> document
+_doc_locks: dict[tuple, threading.Lock] = {}
+
 
 def ensure_dir(p: pathlib.Path):
     p.mkdir(parents=True, exist_ok=True)
 
 
-def cache_path(url: str) -> pathlib.Path:
-    ensure_dir(CACHE_DIR)
+def cache_path(url: str, subdir: str = "", ext: str = ".html") -> pathlib.Path:
+    d = CACHE_DIR / subdir if subdir else CACHE_DIR
+    ensure_dir(d)
     h = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
-    return CACHE_DIR / f"{h}.html"
+    return d / f"{h}{ext}"
+
+
+def cache_store() -> CacheStore:
+    """The page store under CACHE_DIR (re-opened if CACHE_DIR is redirected)."""
+    global _store
+    with _lock:
+        if _store is None or _store.root != CACHE_DIR:
+            _store = CacheStore(CACHE_DIR, CACHE_BUDGET)
+        return _store
+
+
+def _validators(entry: dict) -> dict:
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def session() -> "requests.Session":
+    """One connection-pooled session shared by every fetch (and every thread).
+    requests is imported here, so runs that never fetch never load it."""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            s = requests.Session()
+            s.headers.update(UA)
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS,
+                                  pool_maxsize=MAX_WORKERS)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(PER_HOST)
+        return slot
+
+
+def use_fixtures(replay=None, record=None, origin: str | None = None):
+    """Switch fetch() to offline fixtures (see extractors/fixtures.py).
+
+    replay: Corpus to serve every page from; no network, no disk cache.
+    record: Corpus to snapshot every page fetch() returns into.
+    origin: e.g. "http://127.0.0.1:8000"; requests go there (a stand-in
+            server) while the cache and corpora stay keyed on real URLs.
+    """
+    global _fixtures, _recorder, _origin
+    _fixtures, _recorder, _origin = replay, record, origin
+
+
+def request(url: str, headers: dict | None = None) -> "requests.Response":
+    """GET `url` with per-host throttling and exponential backoff on transient errors."""
+    import requests
+    if _origin:
+        u = urlsplit(url)
+        url = _origin.rstrip("/") + u.path + (f"?{u.query}" if u.query else "")
+    for attempt in range(RETRIES + 1):
+        last = attempt == RETRIES
+        try:
+            with _host_slot(url):
+                start = time.perf_counter()
+                r = session().get(url, headers=headers, timeout=20)
+            metrics.sample("http.latency_ms", (time.perf_counter() - start) * 1000)
+            metrics.count("http.requests")
+            metrics.count("http.bytes", len(r.content))
+        except (requests.ConnectionError, requests.Timeout):
+            metrics.count("http.errors")
+            if last:
+                raise
+        else:
+            if r.status_code not in RETRY_STATUS or last:
+                r.raise_for_status()
+                return r
+        metrics.count("http.retries")
+        time.sleep(BACKOFF_SEC * 2 ** attempt)
+    raise AssertionError("unreachable")
 
 
 def fetch(url: str, use_cache: bool = True, ttl_sec: int = 7*24*3600) -> str:
-    """Fetch with dumb on-disk cache so your builds aren’t brittle."""
-    cp = cache_path(url)
-    if use_cache and cp.exists() and (time.time() - cp.stat().st_mtime) < ttl_sec:
-        return cp.read_text(encoding="utf-8")
-    html = requests.get(url, headers=UA, timeout=20).text
-    cp.write_text(html, encoding="utf-8")
+    """Fetch with dumb on-disk cache so your builds aren’t brittle.
+
+    Entries older than `ttl_sec` are revalidated with If-None-Match /
+    If-Modified-Since; a 304 just refreshes the entry.
+    """
+    if _fixtures is not None:
+        html = _fixtures.get(url)
+        if html is None:
+            raise RuntimeError(f"{url} is not in fixture corpus {_fixtures.root}")
+        metrics.count("fetch.fixture")
+        return html
+    html = _fetch_live(url, use_cache, ttl_sec)
+    if _recorder is not None:
+        _recorder.put(url, html)
+    return html
+
+
+def _fetch_live(url: str, use_cache: bool, ttl_sec: int) -> str:
+    store = cache_store()
+    entry = store.lookup(url) if use_cache else None
+    cached = store.read(url) if entry else None  # None if evicted or corrupt
+    if cached is not None and (time.time() - entry["fetched_at"]) < ttl_sec:
+        metrics.count("cache.hit")
+        return cached
+
+    r = request(url, headers=_validators(entry) if cached is not None else None)
+    if cached is not None and r.status_code == 304:
+        metrics.count("cache.revalidated")
+        store.touch(url)
+        return cached
+    metrics.count("cache.miss")
+
+    html = r.text
+    store.put(url, html, etag=r.headers.get("ETag", ""),
+              last_modified=r.headers.get("Last-Modified", ""))
     return html
 
 
+def fetch_many(urls, use_cache: bool = True, ttl_sec: int = 7*24*3600,
+               max_workers: int = MAX_WORKERS) -> tuple[dict[str, str], dict[str, str]]:
+    """Fetch a batch of URLs concurrently; returns ({url: html} in input order,
+    {url: error} for the ones that failed). One dead link fails only itself."""
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}, {}
+
+    def one(url):
+        try:
+            return fetch(url, use_cache, ttl_sec), None
+        except Exception as e:
+            metrics.count("fetch.failed")
+            return None, f"{type(e).__name__}: {e}"
+
+    pages, failed = {}, {}
+    workers = max(1, min(max_workers, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for url, (html, error) in zip(unique, pool.map(one, unique)):
+            if error is None:
+                pages[url] = html
+            else:
+                failed[url] = error
+    return pages, failed
+
+
 class Extractor:
     """Base class so every extractor exposes name/target_key/run()."""
     name = "base"
     target_key = ""
+    depends_on: tuple[str, ...] = ()  # spec keys run() receives as kwargs
+
+    @property
+    def produces(self) -> tuple[str, ...]:
+        """Spec keys this extractor writes (run() returns a {key: data} dict if >1)."""
+        return (self.target_key,)
+
+    def urls(self) -> list[str]:
+        """Pages run() will fetch; main.py prefetches them all in one batch."""
+        return []
+
+    def sources(self) -> list[pathlib.Path]:
+        """Local files whose contents shape run()'s output."""
+        return [pathlib.Path(__file__), pathlib.Path(parsing.__file__),
+                module_file("extractors.merge"),
+                pathlib.Path(inspect.getsourcefile(type(self)))]
+
+    def fingerprint(self, pages: dict[str, str], deps: dict | None = None,
+                    failed=()) -> str:
+        """Hash of everything run() depends on: settings, sources, pages, upstream data.
+        URLs in `failed` (see fetch_many) count as a fixed marker, so the run after
+        they recover is not skipped."""
+        h = hashlib.sha256()
+        h.update(type(self).__name__.encode("utf-8"))
+        h.update(repr(sorted(vars(self).items())).encode("utf-8"))
+        for p in self.sources():
+            h.update(p.read_bytes())
+        for url in self.urls():
+            h.update(url.encode("utf-8"))
+            if url in failed:
+                h.update(b"\0fetch failed\0")
+                continue
+            html = pages[url] if url in pages else fetch(url)
+            h.update(html.encode("utf-8"))
+        if deps:
+            h.update(json.dumps(deps, sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
 
     def run(self):
         raise NotImplementedError
 
 
-def to_soup(html: str) -> BeautifulSoup:
-    return BeautifulSoup(html, "lxml")
+def set_parser(backend: str):
+    """Pick the HTML backend ("lxml" or "bs4") for every later to_soup()."""
+    global _parser
+    if backend not in parsing.BACKENDS:
+        raise RuntimeError(f"unknown HTML parser backend {backend!r}")
+    _parser = backend
+    clear_doc_cache()
+
+
+def to_soup(html: str, region: parsing.Region | None = None):
+    """Parse `html` (or just `region` of it) with the selected backend.
+
+    See parsing.py for the API the result offers.
+    """
+    with metrics.span(_parser, "parse"):
+        return parsing.parse(html, _parser, region)
+
+
+def fetch_soup(url: str, use_cache: bool = True, region: parsing.Region | None = None):
+    """fetch() + to_soup(), parsed at most once per run (per region).
+
+    The returned tree is shared between extractors: treat it as read-only.
+    """
+    key = (url, region)
+    with _lock:
+        doc_lock = _doc_locks.setdefault(key, threading.Lock())
+    with doc_lock:  # concurrent callers wait for the first parse
+        with _lock:
+            soup = _docs.get(key)
+            if soup is not None:
+                _docs.move_to_end(key)
+                metrics.count("doc_cache.hit")
+                return soup
+        metrics.count("doc_cache.miss")
+        soup = to_soup(fetch(url, use_cache=use_cache), region)
+        with _lock:
+            _docs[key] = soup
+            while len(_docs) > DOC_CACHE_SIZE:
+                _docs.popitem(last=False)
+        return soup
+
+
+def clear_doc_cache():
+    """Drop every parsed document; main.py calls this at the start of a run."""
+    with _lock:
+        _docs.clear()
+        _doc_locks.clear()
+
+
+class TableColumns:
+    """A table as read_table() returns it.
+
+    header:  text of the header row ([] if the table has none)
+    columns: one list per column, a cell per data row ("" where a row is short)
+    widths:  number of cells in each data row
+    links:   {column: [href of the first link in that cell, or ""]}
+    """
+
+    def __init__(self, header, columns, widths, links):
+        self.header, self.columns, self.widths, self.links = header, columns, widths, links
+
+    def __len__(self):
+        return len(self.widths)
+
+    def column(self, i: int) -> list[str]:
+        return self.columns[i] if i < len(self.columns) else [""] * len(self.widths)
+
+
+def read_table(table, links=(), min_cells: int = 1) -> TableColumns:
+    """Read `table` in one pass over its rows, column-wise.
+
+    Rows made only of <th> cells are headers: the first becomes `header`,
+    none of them are data. Rows with fewer than `min_cells` cells are
+    skipped. Cell text is whitespace-collapsed and stripped for the whole
+    table at once rather than cell by cell; `links` names the columns whose
+    first <a href> is collected as well.
+    """
+    header, rows, hrefs = None, [], {c: [] for c in links}
+    for cells in parsing.table_rows(table):
+        if not cells:
+            continue
+        if all(c.name == "th" for c in cells):
+            if header is None:
+                header = cells
+            continue
+        if len(cells) < min_cells:
+            continue
+        rows.append(cells)
+        for c in links:
+            a = cells[c].find("a", href=True) if c < len(cells) else None
+            hrefs[c].append(a["href"] if a else "")
+
+    # collapse whitespace in every cell at once: NUL cannot occur in parsed
+    # HTML and is not whitespace to str.split(), so it survives as the cell boundary
+    raw = [c.get_text(" ") for r in ([header] if header else []) + rows for c in r]
+    texts = [t.strip() for t in " ".join("\0".join(raw).split()).split("\0")]
+
+    pos = 0
+    head = []
+    if header:
+        head, pos = texts[:len(header)], len(header)
+    width = max((len(r) for r in rows), default=0)
+    columns = [[] for _ in range(width)]
+    for r in rows:
+        for i in range(width):
+            columns[i].append(texts[pos + i] if i < len(r) else "")
+        pos += len(r)
+    return TableColumns(head, columns, [len(r) for r in rows], hrefs)
 
 
 def dedup_by_key(items, key="name"):
@@ -52,20 +366,26 @@ def dedup_by_key(items, key="name"):
     return out
 
 
-def merge_into(spec: dict, key: str, items: list[dict]):
-    """Union by 'name' into spec[key]."""
-    existing = {x["name"]: x for x in spec.get(key, []) if "name" in x}
-    for it in items:
-        nm = it.get("name")
-        if not nm:
-            continue
-        if nm in existing:
-            # shallow merge: keep old fields, add new ones if missing
-            existing[nm].update({k: v for k, v in it.items(
-            ) if k not in existing[nm] or existing[nm][k] in (None, [], "")})
-        else:
-            existing[nm] = it
-    spec[key] = sorted(existing.values(), key=lambda x: x["name"].lower())
+def merge_into(spec: dict, key: str, items: list[dict], policy: str = KEEP):
+    """Union by 'name' into spec[key]; existing fields win unless `policy` says
+    otherwise. Use a SpecMerger directly for repeated merges into one spec."""
+    SpecMerger(spec, default=policy).merge(key, items)
+
+
+def module_file(module_path: str) -> pathlib.Path:
+    """Source file of an importable module, e.g. 'extractors.inputs.operators_data'."""
+    spec = importlib.util.find_spec(module_path)
+    if spec is None or not spec.origin:
+        raise RuntimeError(f"module {module_path} not found")
+    return pathlib.Path(spec.origin)
+
+
+def write_if_changed(path: pathlib.Path, data: bytes) -> bool:
+    """Write `data` unless `path` already holds those bytes; returns whether it wrote."""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    atomic_write(path, data)
+    return True
 
 
 def write_to(path: pathlib.Path, data, *, indent: int = 2):
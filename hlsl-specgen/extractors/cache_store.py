@@ -0,0 +1,182 @@
+# extractors/cache_store.py
+# Compressed, content-addressed page cache shared by concurrent generator runs.
+#
+#   cache/objects/ab/abcdef....html.gz   gzip of the page, named by the sha256
+#                                        of its (uncompressed) contents
+#   cache/index.json                     {url: {sha256, size, etag,
+#                                         last_modified, fetched_at, accessed_at}}
+#
+# Every file is written to a temp file and renamed into place, and the index
+# is only rewritten under an exclusive lock (cache/index.lock) after
+# re-reading it, so parallel runs never see or produce a torn file. Corrupt
+# objects fail their hash check and are treated as misses. Once the objects
+# exceed `budget` bytes, least recently used entries are evicted.
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+INDEX_VERSION = 1
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+# mkstemp creates 0600 files; renamed-into-place files get the mode a plain
+# open() would have given them (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write(path: pathlib.Path, data: bytes):
+    """Replace `path` with `data` so readers see either the old or the new file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        pathlib.Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class CacheStore:
+    def __init__(self, root, budget: int = DEFAULT_BUDGET):
+        self.root = pathlib.Path(root)
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._accessed: dict[str, float] = {}  # access times not yet in the index
+        self._entries = self._load_index()
+
+    # ---------- index ----------
+
+    def _load_index(self) -> dict:
+        try:
+            data = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get("entries", {}) if data.get("version") == INDEX_VERSION else {}
+
+    @contextmanager
+    def _locked_index(self):
+        """Exclusive, cross-process access to the index; yields the fresh entries."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / "index.lock", "a+b") as lf:
+            if fcntl:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+            else:
+                lf.seek(0)
+                msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                entries = self._load_index()
+                before = {e["sha256"] for e in entries.values()}
+                for url, t in self._accessed.items():
+                    if url in entries:
+                        entries[url]["accessed_at"] = max(entries[url]["accessed_at"], t)
+                self._accessed.clear()
+                yield entries
+                self._evict(entries)
+                atomic_write(self.root / "index.json", json.dumps(
+                    {"version": INDEX_VERSION, "entries": entries},
+                    sort_keys=True).encode("utf-8"))
+                self._entries = entries
+                # objects are only written under this lock, so anything no
+                # longer referenced can go
+                for sha in before - {e["sha256"] for e in entries.values()}:
+                    self._object(sha).unlink(missing_ok=True)
+            finally:
+                if fcntl:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+                else:
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _object(self, sha: str) -> pathlib.Path:
+        return self.root / "objects" / sha[:2] / f"{sha}.html.gz"
+
+    # ---------- reads ----------
+
+    def lookup(self, url: str) -> dict | None:
+        """Index entry (validators, fetched_at, ...) for `url`, if cached."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def read(self, url: str) -> str | None:
+        """Cached page for `url`, or None if missing or failing its integrity check."""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+        try:
+            data = gzip.decompress(self._object(entry["sha256"]).read_bytes())
+        except (OSError, EOFError):
+            data = None
+        if data is None or hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            self.drop(url)
+            return None
+        with self._lock:
+            self._accessed[url] = time.time()
+        return data.decode("utf-8")
+
+    # ---------- writes ----------
+
+    def put(self, url: str, html: str, etag: str = "", last_modified: str = ""):
+        data = html.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        obj = self._object(sha)
+        blob = gzip.compress(data, mtime=0)
+        now = time.time()
+        with self._locked_index() as entries:
+            if not obj.exists():
+                atomic_write(obj, blob)
+            entries[url] = {"sha256": sha, "size": obj.stat().st_size,
+                            "etag": etag, "last_modified": last_modified,
+                            "fetched_at": now, "accessed_at": now}
+
+    def touch(self, url: str):
+        """Mark `url` as freshly revalidated (after a 304)."""
+        now = time.time()
+        with self._locked_index() as entries:
+            if url in entries:
+                entries[url]["fetched_at"] = entries[url]["accessed_at"] = now
+
+    def drop(self, url: str):
+        with self._locked_index() as entries:
+            entries.pop(url, None)
+
+    def flush(self):
+        """Persist pending access times (they drive LRU eviction)."""
+        with self._lock:
+            pending = bool(self._accessed)
+        if pending:
+            with self._locked_index():
+                pass
+
+    # ---------- eviction ----------
+
+    def _evict(self, entries: dict):
+        """Drop least recently used entries until the objects fit the budget."""
+        refs: dict[str, int] = {}
+        sizes: dict[str, int] = {}
+        for e in entries.values():
+            refs[e["sha256"]] = refs.get(e["sha256"], 0) + 1
+            sizes[e["sha256"]] = e["size"]
+        total = sum(sizes.values())
+        for url in sorted(entries, key=lambda u: entries[u]["accessed_at"]):
+            if total <= self.budget:
+                break
+            sha = entries.pop(url)["sha256"]
+            refs[sha] -= 1
+            if not refs[sha]:
+                total -= sizes[sha]
@@ -0,0 +1,120 @@
+# extractors/fixtures.py
+# Recorded page corpora for offline, reproducible runs.
+#
+# A corpus is a directory holding index.json plus one file per page:
+#   {"version": 1, "pages": {url: {"file": "<sha16>.html", "sha256": "..."}}}
+# main.py can record every fetched page into one (--record DIR), replay a run
+# from one without touching the network (--fixtures DIR), or point fetches at
+# a local stand-in that serves one over HTTP (--origin, see `serve` below):
+#   python -m extractors.fixtures serve DIR [--port 8000]
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+
+VERSION = 1
+
+
+class Corpus:
+    def __init__(self, root):
+        self.root = pathlib.Path(root)
+        self._lock = threading.Lock()
+        self.pages: dict[str, dict] = {}
+        index = self.root / "index.json"
+        if index.exists():
+            data = json.loads(index.read_text(encoding="utf-8"))
+            if data.get("version") != VERSION:
+                raise RuntimeError(
+                    f"{index}: unsupported fixture corpus version {data.get('version')}")
+            self.pages = data["pages"]
+
+    def get(self, url: str) -> str | None:
+        entry = self.pages.get(url)
+        if entry is None:
+            return None
+        data = (self.root / entry["file"]).read_bytes()
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise RuntimeError(f"fixture for {url} does not match its recorded hash")
+        return data.decode("utf-8")
+
+    def put(self, url: str, html: str):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        name = f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.html"
+        with self._lock:
+            if self.pages.get(url, {}).get("sha256") == digest:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / name).write_bytes(data)
+            self.pages[url] = {"file": name, "sha256": digest}
+            tmp = self.root / "index.json.tmp"
+            tmp.write_text(json.dumps({"version": VERSION, "pages": self.pages},
+                                      indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(tmp, self.root / "index.json")
+
+    def by_path(self, path: str) -> str | None:
+        """Recorded URL whose path (+ query) is `path`, for the stand-in server."""
+        path = unquote(path)
+        for url in self.pages:
+            u = urlsplit(url)
+            if unquote(u.path + (f"?{u.query}" if u.query else "")) == path:
+                return url
+        return None
+
+
+def serve(corpus: Corpus, host: str = "127.0.0.1", port: int = 8000):
+    """Serve `corpus` over HTTP, with ETags so conditional fetches get 304s."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = corpus.by_path(self.path)
+            if url is None:
+                self.send_error(404)
+                return
+            etag = f'"{corpus.pages[url]["sha256"]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = corpus.get(url).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"[fixtures] serving {len(corpus.pages)} pages from {corpus.root} "
+          f"on http://{host}:{server.server_port}")
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or serve a fixture corpus")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="serve a corpus as a local MS Learn stand-in")
+    s.add_argument("root")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8000)
+    ls = sub.add_parser("list", help="list the recorded URLs")
+    ls.add_argument("root")
+    args = ap.parse_args()
+
+    corpus = Corpus(args.root)
+    if args.cmd == "list":
+        for url in sorted(corpus.pages):
+            print(url)
+    else:
+        serve(corpus, args.host, args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
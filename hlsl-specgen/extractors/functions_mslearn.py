@@ -1,8 +1,16 @@
 # extractors/functions_mslearn.py
 import re
-from .base import Extractor, fetch, to_soup, dedup_by_key
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from .base import (Extractor, fetch, fetch_soup, to_soup, dedup_by_key, read_table,
+                   cache_path, atomic_write, MAX_WORKERS, Region)
 
 WS = re.compile(r"\s+")
+SIGNATURE = re.compile(
+    r"^(?P<ret>.+?)\s+(?P<name>[A-Za-z_]\w*)\s*\((?P<params>.*?)\)\s*;?", re.S)
+PARAM_MODIFIERS = {"in", "out", "inout", "uniform", "const", "precise"}
 
 # map Unicode superscripts to normal digits
 _SUPER_TO_DIGIT = str.maketrans({
@@ -16,50 +24,193 @@ class FunctionsMSLearn(Extractor):
     target_key = "functions"
 
     def __init__(self,
-                 url="https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-intrinsic-functions"):
+                 url="https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-intrinsic-functions",
+                 details=True):
         self.url = url
+        self.details = details  # visit each intrinsic's page for its signature
 
-    def run(self):
-        html = fetch(self.url, use_cache=True)
-        soup = to_soup(html)
+    def urls(self):
+        """The intrinsics index plus, with details on, every page it links to
+        (read off the index, so a changed detail page changes the fingerprint)."""
+        if not self.details:
+            return [self.url]
+        t = self._index()
+        return [self.url] + [urljoin(self.url, href)
+                             for name, href in zip(t.column(0), t.links[0])
+                             if href and self._clean(name)]
+
+    def _index(self):
+        soup = fetch_soup(self.url, region=Region("div", "content", tables=1))
 
         tables = soup.select("div.content table")
         if not tables:
             raise RuntimeError(
                 "No tables found under .content on intrinsics page")
 
-        table = tables[0]  # first table only
-        out = []
+        # first table only: name | description | minimum shader model
+        return read_table(tables[0], links=(0,), min_cells=2)
 
-        for tr in table.find_all("tr"):
-            cells = tr.find_all(["td", "th"])
-            if len(cells) < 2 or cells[0].name == "th":
-                continue
+    def run(self):
+        t = self._index()
+        out, pages = [], []
 
-            name = self._clean(cells[0].get_text(" ", strip=True))
+        for name, desc, raw_sm, href in zip(t.column(0), t.column(1), t.column(2),
+                                            t.links[0]):
+            name = self._clean(name)
             if not name:
                 continue
-
-            desc = self._clean(cells[1].get_text(" ", strip=True))
-            raw_sm = self._clean(cells[2].get_text(
-                " ", strip=True)) if len(cells) >= 3 else ""
-            min_sm = self._normalize_sm(raw_sm)
+            desc = self._clean(desc)
+            min_sm = self._normalize_sm(self._clean(raw_sm))
+            pages.append(urljoin(self.url, href) if href else "")
 
             out.append({
                 "name": name,
                 "kind": "intrinsic",
                 "description": desc,         # single string
                 "min_shader_model": min_sm,  # e.g. "2_1", "4_0", "" if unknown
-                "return_type": "",           # intentionally empty for now
-                "parameters": []             # intentionally empty for now
+                "return_type": "",           # filled from the detail page
+                "parameters": []             # filled from the detail page
             })
 
         if not out:
             raise RuntimeError(
                 "Intrinsic functions table parsed but yielded 0 rows")
 
+        if self.details:
+            self._fill_signatures(out, pages)
+
         return dedup_by_key(out, key="name")
 
+    # ---------- detail pages ----------
+
+    def _fill_signatures(self, items, pages):
+        """Fetch + parse every intrinsic's own page on a worker pool."""
+        todo = [(it, url) for it, url in zip(items, pages) if url]
+        parser = self._parser_digest()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            sigs = pool.map(lambda t: self._signature(t[1], parser), todo)
+            for (it, url), sig in zip(todo, sigs):
+                if sig is None:
+                    print(f"[warn] no signature for {it['name']} ({url})")
+                    continue
+                it["return_type"] = sig["return_type"]
+                it["parameters"] = sig["parameters"]
+
+    def _parser_digest(self):
+        """Hash of the code that turns a detail page into a signature: every
+        file in sources(), this module and parsing.py among them."""
+        h = hashlib.sha256()
+        for p in self.sources():
+            h.update(p.read_bytes())
+        return h.hexdigest()
+
+    def _signature(self, url, parser):
+        """Signature of one detail page, cached per page keyed on its HTML hash
+        and on `parser` (see _parser_digest), so parser fixes take effect."""
+        try:
+            html = fetch(url, use_cache=True)
+        except Exception as e:
+            print(f"[warn] fetch failed for {url}: {e}")
+            return None
+
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        cp = cache_path(url, "signatures", ".json")
+        if cp.exists():
+            try:
+                cached = json.loads(cp.read_text(encoding="utf-8"))
+                if cached.get("html_sha256") == digest and cached.get("parser") == parser:
+                    return cached["signature"]
+            except (json.JSONDecodeError, KeyError):
+                pass
+
+        sig = self._parse_signature(html)
+        atomic_write(cp, json.dumps({"html_sha256": digest, "parser": parser,
+                                     "signature": sig},
+                                    ensure_ascii=False).encode("utf-8"))
+        return sig
+
+    def _parse_signature(self, html):
+        soup = to_soup(html, Region("div", "content"))
+
+        h2 = soup.find("h2", id="syntax") or soup.find(
+            "h2", string=re.compile(r"^\s*Syntax\s*$", re.I))
+        pre = h2.find_next("pre") if h2 else None
+        if not pre:
+            return None
+        m = SIGNATURE.match(WS.sub(" ", pre.get_text()).strip())
+        if not m:
+            return None
+
+        docs = self._section_table(soup, "parameters", key_col=0)
+        types = self._section_table(soup, "type-description", key_col=0)
+
+        params = []
+        for raw in self._split_params(m.group("params")):
+            p = self._parse_param(raw, types)
+            if p:
+                p["description"] = docs.get(p["name"], "")
+                params.append(p)
+
+        # the syntax block names the return value too (`ret abs(x)`); its type
+        # is in the type table like a parameter's
+        ret = self._clean(m.group("ret"))
+        return {"return_type": types.get(ret, ret), "parameters": params}
+
+    def _section_table(self, soup, section_id, key_col=0):
+        """{first word of key column: text of next column} for the table under an h2."""
+        h2 = soup.find("h2", id=section_id)
+        table = h2.find_next("table") if h2 else None
+        if not table:
+            return {}
+        t = read_table(table, min_cells=key_col + 2)
+        out = {}
+        for key, value in zip(t.column(key_col), t.column(key_col + 1)):
+            key = self._clean(key)
+            if key:
+                out.setdefault(key.split()[0], self._clean(value))
+        return out
+
+    def _split_params(self, s):
+        """Split a parameter list on top-level commas."""
+        out, depth, cur = [], 0, []
+        for ch in s:
+            if ch in "<[(":
+                depth += 1
+            elif ch in ">])":
+                depth -= 1
+            if ch == "," and depth == 0:
+                out.append("".join(cur))
+                cur = []
+            else:
+                cur.append(ch)
+        out.append("".join(cur))
+        return [p.strip() for p in out if p.strip() and p.strip() != "void"]
+
+    def _parse_param(self, raw, types):
+        optional = raw.startswith("[") and raw.endswith("]")
+        if optional:
+            raw = raw[1:-1].strip()
+        raw = raw.split("=", 1)[0].strip()  # drop default values
+
+        tokens = raw.split()
+        modifiers = []
+        while tokens and tokens[0].lower() in PARAM_MODIFIERS:
+            modifiers.append(tokens.pop(0).lower())
+        if not tokens:
+            return None
+
+        name = tokens[-1]
+        typ = " ".join(tokens[:-1])
+        # keep array suffixes on the type: `float x[2]` -> type `float[2]`
+        arr = name.find("[")
+        if arr > 0:
+            name, typ = name[:arr], typ + name[arr:]
+        if not typ:
+            typ = types.get(name, "")
+
+        return {"name": name, "type": typ, "modifiers": modifiers,
+                "optional": optional}
+
     def _clean(self, s: str) -> str:
         s = WS.sub(" ", s or "").strip()
         # trim surrounding quotes/backticks if the cell used them
@@ -1,6 +1,6 @@
 # extractors/keywords_mslearn.py
 import re
-from .base import Extractor, fetch, to_soup, dedup_by_key
+from .base import Extractor, fetch_soup, dedup_by_key, Region
 
 IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
@@ -14,6 +14,9 @@ class KeywordsMSLearn(Extractor):
         self.keywords_url = keywords_url
         self.reserved_url = reserved_url
 
+    def urls(self):
+        return [self.keywords_url, self.reserved_url]
+
     def run(self):
         items = []
         items += self._extract_keywords()
@@ -23,8 +26,7 @@ class KeywordsMSLearn(Extractor):
         return dedup_by_key(items, key="name")
 
     def _extract_keywords(self):
-        html = fetch(self.keywords_url, use_cache=True)
-        soup = to_soup(html)
+        soup = fetch_soup(self.keywords_url)
 
         h2 = soup.find("h2", id="ms--in-this-article")
         if not h2:
@@ -44,8 +46,7 @@ class KeywordsMSLearn(Extractor):
         return items
 
     def _extract_reserved(self):
-        html = fetch(self.reserved_url, use_cache=True)
-        soup = to_soup(html)
+        soup = fetch_soup(self.reserved_url, region=Region("div", "column"))
 
         content = soup.find("div", class_="column")
         if not content:
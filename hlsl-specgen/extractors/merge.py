@@ -0,0 +1,141 @@
+"""Incremental, name-keyed merges into spec categories.
+
+A SpecMerger builds one {name: entry} index per category the first time it is
+touched and keeps it for the rest of the run, so every later merge is a dict
+lookup per item instead of a rebuild of the whole category. Entries are updated
+in place; only new entries are inserted (bisect for a handful, one sort for a
+large batch) and only entries the generator itself used to produce are removed.
+
+A field counts as hand-curated when its value differs from what the generator
+produced for it last time (see record()); curated values are kept whatever the
+policy, everything else follows the source.
+"""
+import bisect
+import hashlib
+import json
+
+# field-level merge policies
+KEEP = "keep"        # existing value wins; new value only fills missing/empty fields
+REPLACE = "replace"  # non-empty new value wins; empty values never clobber
+UNION = "union"      # lists: existing items, then new items not already present
+
+POLICIES = (KEEP, REPLACE, UNION)
+
+
+def _empty(v) -> bool:
+    return v is None or v == [] or v == "" or v == {}
+
+
+def _sort_key(entry: dict) -> str:
+    return entry["name"].lower()
+
+
+def value_hash(v) -> str:
+    return hashlib.sha256(json.dumps(v, sort_keys=True, ensure_ascii=False)
+                          .encode("utf-8")).hexdigest()[:16]
+
+
+def record(items) -> dict:
+    """{name: {field: value_hash}} of what a generator produced; pass it back to
+    the next merge() as `generated`."""
+    return {it["name"]: {k: value_hash(v) for k, v in it.items()}
+            for it in items if it.get("name")}
+
+
+class SpecMerger:
+    def __init__(self, spec: dict, policies: dict | None = None, default: str = KEEP,
+                 sort: set | None = None):
+        """`policies` maps category -> {field: policy}; fields not listed use
+        `default`. `sort` names the categories kept ordered by name (case-insensitive);
+        None keeps all of them sorted. The others are laid out in the generator's
+        order, followed by hand-added entries."""
+        for p in [default] + [p for fields in (policies or {}).values() for p in fields.values()]:
+            if p not in POLICIES:
+                raise RuntimeError(f"unknown merge policy {p!r}")
+        self.spec = spec
+        self.policies = policies or {}
+        self.default = default
+        self.sort = sort
+        self._index = {}
+
+    def _sorted(self, key: str) -> bool:
+        return self.sort is None or key in self.sort
+
+    def index(self, key: str) -> dict:
+        """{name: entry} for spec[key], built once per category."""
+        idx = self._index.get(key)
+        if idx is None:
+            items = self.spec.setdefault(key, [])
+            named = [x for x in items if isinstance(x, dict) and x.get("name")]
+            if len(named) != len(items):
+                items[:] = named
+            if self._sorted(key) and any(_sort_key(a) > _sort_key(b)
+                                         for a, b in zip(items, items[1:])):
+                items.sort(key=_sort_key)
+            idx = self._index[key] = {}
+            for x in items:
+                idx.setdefault(x["name"], x)
+        return idx
+
+    def _merge_fields(self, cur: dict, new: dict, policies: dict, generated: dict) -> bool:
+        changed = False
+        for k, v in new.items():
+            policy = policies.get(k, self.default)
+            old = cur.get(k)
+            if k not in cur:
+                val = v
+            elif k in generated and value_hash(old) != generated[k]:
+                val = old  # edited by hand since the generator last wrote it
+            elif policy == KEEP:
+                val = v if _empty(old) else old
+            elif policy == UNION and isinstance(old, list) and isinstance(v, list):
+                val = old + [x for x in v if x not in old]
+            else:  # REPLACE, or UNION on non-lists
+                val = old if _empty(v) else v
+            if k not in cur or val != old:
+                cur[k] = val
+                changed = True
+        return changed
+
+    def merge(self, key: str, items: list[dict], remove=(), generated: dict | None = None) -> dict:
+        """Merge `items` into spec[key] by name. Names in `remove` that are not in
+        `items` are dropped (pass the names this generator produced last time so
+        stale generated entries go while hand-added ones stay). `generated` is
+        the record() of the generator's previous output; fields it does not
+        cover follow their policy. Returns {"added", "updated", "removed"} counts."""
+        idx = self.index(key)
+        entries = self.spec[key]
+        policies = self.policies.get(key, {})
+        generated = generated or {}
+        added, updated, seen, order = [], 0, set(), []
+        for it in items:
+            nm = it.get("name")
+            if not nm or nm in seen:
+                continue
+            seen.add(nm)
+            cur = idx.get(nm)
+            if cur is None:
+                idx[nm] = it
+                added.append(it)
+            elif cur is not it and self._merge_fields(cur, it, policies,
+                                                      generated.get(nm, {})):
+                updated += 1
+            order.append(idx[nm])
+
+        gone = {nm for nm in remove if nm not in seen and nm in idx}
+        if gone:
+            entries[:] = [x for x in entries if x["name"] not in gone]
+            for nm in gone:
+                del idx[nm]
+
+        if not self._sorted(key):
+            # generator order, then hand-added entries: the layout depends on the
+            # inputs, not on which entries earlier runs happened to add first
+            entries[:] = order + [x for x in entries if x["name"] not in seen]
+        elif len(added) > len(entries) // 8:
+            entries.extend(added)
+            entries.sort(key=_sort_key)  # timsort: linear on the sorted prefix + run
+        else:
+            for it in added:
+                bisect.insort(entries, it, key=_sort_key)
+        return {"added": len(added), "updated": updated, "removed": len(gone)}
@@ -0,0 +1,103 @@
+# extractors/metrics.py
+# Process-wide run instrumentation: timing spans, counters and latency samples.
+#
+#   with metrics.span("parse", "parse"): ...    # named, categorized interval
+#   metrics.count("cache.hit")                  # monotonically increasing counter
+#   metrics.sample("http.latency_ms", 123.4)    # distribution (percentiles)
+#
+# Everything is thread-safe and cheap enough to leave on; main.py turns the
+# result into out/run_report.json and, on request, a Chrome trace-event file
+# (chrome://tracing, Perfetto).
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_t0 = time.perf_counter()
+_spans: list[tuple] = []  # (name, category, start, duration, thread id)
+_counters: dict[str, float] = {}
+_samples: dict[str, list[float]] = {}
+
+
+def reset():
+    """Forget everything recorded so far (start of a run / benchmark repeat)."""
+    global _t0
+    with _lock:
+        _t0 = time.perf_counter()
+        _spans.clear()
+        _counters.clear()
+        _samples.clear()
+
+
+@contextmanager
+def span(name: str, category: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _spans.append((name, category, start - _t0, end - start, threading.get_ident()))
+
+
+def count(name: str, n: float = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def sample(name: str, value: float):
+    with _lock:
+        _samples.setdefault(name, []).append(value)
+
+
+def percentiles(values, ps=(50, 90, 99)) -> dict:
+    """Nearest-rank percentiles plus count/min/max/mean of `values`."""
+    if not values:
+        return {"count": 0}
+    v = sorted(values)
+    out = {"count": len(v), "min": v[0], "max": v[-1], "mean": sum(v) / len(v)}
+    for p in ps:
+        out[f"p{p}"] = v[max(0, -(-p * len(v) // 100) - 1)]
+    return {k: round(x, 3) if isinstance(x, float) else x for k, x in out.items()}
+
+
+def report() -> dict:
+    """{"wall_s", "stages", "spans", "counters", "distributions"} for the run so far.
+
+    stages: total seconds per category (spans on parallel threads add up, so
+    these can exceed wall time); spans: count/total/max per (category, name).
+    """
+    with _lock:
+        spans, counters = list(_spans), dict(_counters)
+        samples = {k: list(v) for k, v in _samples.items()}
+        wall = time.perf_counter() - _t0
+    stages, by_name = {}, {}
+    for name, cat, _, dur, _ in spans:
+        stages[cat] = stages.get(cat, 0.0) + dur
+        s = by_name.setdefault(f"{cat}:{name}", {"count": 0, "total_s": 0.0, "max_s": 0.0})
+        s["count"] += 1
+        s["total_s"] += dur
+        s["max_s"] = max(s["max_s"], dur)
+    for s in by_name.values():
+        s["total_s"] = round(s["total_s"], 6)
+        s["max_s"] = round(s["max_s"], 6)
+    return {
+        "wall_s": round(wall, 6),
+        "stages": {k: round(v, 6) for k, v in stages.items()},
+        "spans": dict(sorted(by_name.items())),
+        "counters": dict(sorted(counters.items())),
+        "distributions": {k: percentiles(v) for k, v in sorted(samples.items())},
+    }
+
+
+def trace_events() -> dict:
+    """Spans in Chrome trace-event format ("X" complete events, microseconds)."""
+    pid = os.getpid()
+    with _lock:
+        spans = list(_spans)
+    return {"traceEvents": [
+        {"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+         "ts": round(start * 1e6, 3), "dur": round(dur * 1e6, 3)}
+        for name, cat, start, dur, tid in spans
+    ], "displayTimeUnit": "ms"}
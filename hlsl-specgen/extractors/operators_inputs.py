@@ -1,5 +1,5 @@
 import importlib
-from .base import Extractor, dedup_by_key
+from .base import Extractor, dedup_by_key, module_file
 
 class OperatorsIn(Extractor):
     name = "Operators (local inputs)"
@@ -9,6 +9,9 @@ class OperatorsIn(Extractor):
         self.module_path = module_path
         self.attr = attr
 
+    def sources(self):
+        return super().sources() + [module_file(self.module_path)]
+
     def run(self):
         mod = importlib.import_module(self.module_path)
         ops = getattr(mod, self.attr, None)
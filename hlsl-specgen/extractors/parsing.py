@@ -0,0 +1,269 @@
+# extractors/parsing.py
+# HTML parser backends behind base.to_soup().
+#
+# Extractors only use this subset of the BeautifulSoup API, which every
+# backend provides:
+#   doc.select(css)                      simple selectors: "div.content table"
+#   node.find(name, id=, class_=, string=, <attr>=True|str)
+#   node.find_all(name | [names], recursive=True)
+#   node.find_next(name), node.find_previous(name)
+#   node.get_text(separator="", strip=False), node.name, node["attr"], node.get()
+# plus table_rows(table), which each backend answers its fastest way.
+#
+# "bs4" returns a real BeautifulSoup tree (the reference behaviour); "lxml"
+# wraps a plain lxml.html tree, skipping BeautifulSoup's Python-level tree
+# building, and must produce identical spec output.
+#
+# Passing a Region builds a tree for just that part of the page: bs4 strains
+# everything else out, lxml drops it while parsing (and with Region.tables,
+# stops parsing early).
+import re
+
+BACKENDS = ("lxml", "bs4")
+
+# strings BeautifulSoup's get_text() leaves out
+_SKIP_TEXT = {"script", "style"}
+_SIMPLE = re.compile(r"^(?P<tag>[a-z][a-z0-9]*|\*)?(?P<rest>(?:[.#][\w-]+)*)$", re.I)
+_CHUNK = 16 * 1024
+
+
+class Region:
+    """The part of a page an extractor reads: the `tag.cls` element(s).
+
+    The result is a document whose only content is every matching element
+    (outermost ones, in page order), so extractors query it exactly as they
+    query a full page. `tables` lets the lxml backend stop once that many
+    tables inside the region(s) are complete, for extractors that read no
+    further than those.
+    """
+
+    def __init__(self, tag: str, cls: str | None = None, tables: int | None = None):
+        self.tag, self.cls, self.tables = tag, cls, tables
+
+    def _key(self):
+        return (self.tag, self.cls, self.tables)
+
+    def __eq__(self, other):
+        return isinstance(other, Region) and other._key() == self._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Region({self.tag!r}, cls={self.cls!r}, tables={self.tables!r})"
+
+    def matches(self, el) -> bool:
+        return el.tag == self.tag and (
+            self.cls is None or self.cls in (el.get("class") or "").split())
+
+
+def parse(html: str, backend: str, region: Region | None = None):
+    if backend == "bs4":
+        from bs4 import BeautifulSoup, SoupStrainer
+        if region is None:
+            return BeautifulSoup(html, "lxml")
+        # match class tokens: bs4 4.15 compares class_ to the whole attribute,
+        # so <div class="content is-dense"> would not match "content"
+        attrs = {"class": lambda c: c and region.cls in c.split()} if region.cls else {}
+        return BeautifulSoup(html, "lxml", parse_only=SoupStrainer(region.tag, attrs=attrs))
+    if backend == "lxml":
+        import lxml.html
+        if not html.strip():
+            html = "<html></html>"
+        if region is None:
+            return LxmlNode(lxml.html.document_fromstring(html))
+        return _parse_region(html, region)
+    raise RuntimeError(f"unknown HTML parser backend {backend!r} (expected one of {BACKENDS})")
+
+
+def _parse_region(html: str, region: Region):
+    """Incrementally parse `html`, keeping every `region` element and dropping
+    everything else; stops early once `region.tables` tables are complete."""
+    from lxml import etree
+
+    # only region-tag and table events reach Python; the rest stays in libxml2
+    parser = etree.HTMLPullParser(events=("start", "end"), tag=(region.tag, "table"))
+    # regions are moved under an empty document as they close, like a strained soup
+    container = etree.Element("html")
+    root, found, tables, done = None, False, 0, False
+    for i in range(0, len(html), _CHUNK):
+        parser.feed(html[i:i + _CHUNK])
+        for event, el in parser.read_events():
+            if root is None:
+                if event == "start" and region.matches(el):
+                    root, found = el, True
+                elif event == "end" and el.tag == region.tag:
+                    el.clear(keep_tail=True)  # outside any region: free it early
+            elif event == "end":
+                if el is root:
+                    _detach(container, root)  # before an enclosing element is freed
+                    root = None
+                elif el.tag == "table":
+                    tables += 1
+                    done = region.tables is not None and tables >= region.tables
+            if done:
+                break
+        if done:
+            break
+    doc = parser.close()
+    if root is not None:
+        _detach(container, root)
+    if not found:
+        return LxmlNode(doc)  # region missing: let the extractor report it
+    return LxmlNode(container)
+
+
+def _detach(container, el):
+    container.append(el)
+    el.tail = None
+
+
+def _class_test(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def css_to_xpath(css: str) -> str:
+    """Translate a descendant chain of tag/.class/#id selectors to XPath."""
+    steps = []
+    for part in css.split():
+        m = _SIMPLE.match(part)
+        if not m:
+            raise RuntimeError(f"unsupported selector {css!r}")
+        preds = []
+        for kind, value in re.findall(r"([.#])([\w-]+)", m.group("rest")):
+            preds.append(_class_test(value) if kind == "." else f"@id='{value}'")
+        steps.append((m.group("tag") or "*").lower() + "".join(f"[{p}]" for p in preds))
+    return "descendant::" + "/descendant::".join(steps)
+
+
+class LxmlNode:
+    """An lxml.html element answering the BeautifulSoup subset extractors use."""
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def __eq__(self, other):
+        return isinstance(other, LxmlNode) and other.el is self.el
+
+    def __hash__(self):
+        return id(self.el)
+
+    @property
+    def name(self) -> str:
+        return self.el.tag
+
+    def __getitem__(self, key):
+        v = self.el.get(key)
+        if v is None:
+            raise KeyError(key)
+        return v
+
+    def get(self, key, default=None):
+        return self.el.get(key, default)
+
+    # ---------- text ----------
+
+    def _strings(self, el):
+        if el.tag in _SKIP_TEXT:
+            return
+        if el.text:
+            yield el.text
+        for child in el:
+            if isinstance(child.tag, str):  # not a comment / PI
+                yield from self._strings(child)
+            if child.tail:
+                yield child.tail
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        parts = self._strings(self.el)
+        if strip:
+            parts = (s.strip() for s in parts)
+            parts = [s for s in parts if s]
+        return separator.join(parts)
+
+    @property
+    def string(self):
+        """BeautifulSoup's .string: the text of a node with exactly one child string."""
+        el = self.el
+        while True:
+            kids = [c for c in el if isinstance(c.tag, str)]
+            if not kids:
+                return el.text
+            if len(kids) == 1 and not el.text and not kids[0].tail:
+                el = kids[0]
+                continue
+            return None
+
+    # ---------- navigation ----------
+
+    def _wrap(self, els):
+        return [LxmlNode(e) for e in els]
+
+    def _test(self, name, attrs) -> str:
+        names = [name] if isinstance(name, str) else list(name or [])
+        test = "*" if not names else None
+        preds = []
+        if names and len(names) > 1:
+            test = "*"
+            preds.append(" or ".join(f"self::{n}" for n in names))
+        elif names:
+            test = names[0]
+        for key, value in attrs.items():
+            if key == "class_":
+                preds.append(_class_test(value))
+            elif value is True:
+                preds.append(f"@{key}")
+            else:
+                preds.append(f"@{key}='{value}'")
+        return test + "".join(f"[{p}]" for p in preds)
+
+    def find_all(self, name=None, recursive: bool = True, string=None, **attrs):
+        axis = "descendant" if recursive else "child"
+        found = self._wrap(self.el.xpath(f"{axis}::{self._test(name, attrs)}"))
+        if string is not None:
+            found = [n for n in found if _string_matches(n.string, string)]
+        return found
+
+    def find(self, name=None, recursive: bool = True, string=None, **attrs):
+        if string is None:
+            axis = "descendant" if recursive else "child"
+            hits = self.el.xpath(f"({axis}::{self._test(name, attrs)})[1]")
+            return LxmlNode(hits[0]) if hits else None
+        found = self.find_all(name, recursive, string, **attrs)
+        return found[0] if found else None
+
+    def find_next(self, name=None, **attrs):
+        t = self._test(name, attrs)
+        hits = self.el.xpath(f"(descendant::{t} | following::{t})[1]")
+        return LxmlNode(hits[0]) if hits else None
+
+    def find_previous(self, name=None, **attrs):
+        t = self._test(name, attrs)
+        hits = self.el.xpath(f"(ancestor::{t} | preceding::{t})[last()]")
+        return LxmlNode(hits[0]) if hits else None
+
+    def select(self, css: str):
+        return self._wrap(self.el.xpath(css_to_xpath(css)))
+
+    def select_one(self, css: str):
+        found = self.select(css)
+        return found[0] if found else None
+
+
+def table_rows(table) -> list[list]:
+    """The <td>/<th> cells of every <tr> under `table`, as nodes, in document
+    order: table.find_all("tr") then tr.find_all(["td", "th"]), without a
+    tree query per row on lxml."""
+    if isinstance(table, LxmlNode):
+        return [[LxmlNode(c) for c in tr.iterdescendants("td", "th")]
+                for tr in table.el.iter("tr")]
+    return [tr.find_all(["td", "th"]) for tr in table.find_all("tr")]
+
+
+def _string_matches(s, pattern) -> bool:
+    if s is None:
+        return False
+    if hasattr(pattern, "search"):
+        return pattern.search(s) is not None
+    return s == pattern
@@ -0,0 +1,39 @@
+# extractors/registry.py
+# Every extractor by short name, as "module:Class" strings, so the CLI can list
+# and select extractors without importing them. An extractor's module (and,
+# through fetch/parse, requests, lxml or bs4) loads only once it is selected.
+import importlib
+
+# declaration order: results are merged into the spec in this order
+REGISTRY = {
+    "keywords": "extractors.keywords_mslearn:KeywordsMSLearn",
+    "operators": "extractors.operators_inputs:OperatorsIn",
+    "types": "extractors.types_mslearn:TypesMSLearn",
+    "variables": "extractors.variables_mslearn:VariablesMSLearn",
+    "functions": "extractors.functions_mslearn:FunctionsMSLearn",
+}
+# extractors that read only local inputs (no fetch)
+LOCAL = {"operators"}
+
+
+def select(names=None) -> list[str]:
+    """`names` (all when empty) validated and put in declaration order."""
+    if not names:
+        return list(REGISTRY)
+    unknown = [n for n in names if n not in REGISTRY]
+    if unknown:
+        raise RuntimeError(f"unknown extractor(s) {', '.join(unknown)}; "
+                           f"choose from {', '.join(REGISTRY)}")
+    return [n for n in REGISTRY if n in names]
+
+
+def load(name: str) -> type:
+    """Import and return the extractor class registered as `name`."""
+    module, _, cls = REGISTRY[name].partition(":")
+    return getattr(importlib.import_module(module), cls)
+
+
+def create(names=None, options: dict | None = None) -> list:
+    """Instances of the selected extractors; options maps name -> constructor kwargs."""
+    options = options or {}
+    return [load(n)(**options.get(n, {})) for n in select(names)]
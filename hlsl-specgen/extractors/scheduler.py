@@ -0,0 +1,67 @@
+# extractors/scheduler.py
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .base import MAX_WORKERS
+
+
+def outputs(ex, data) -> dict:
+    """Normalize run()'s return value to {spec key: data}."""
+    keys = ex.produces
+    if len(keys) == 1:
+        return {keys[0]: data}
+    if not isinstance(data, dict) or set(data) != set(keys):
+        raise RuntimeError(f"{ex.name}: run() must return a dict with keys {keys}")
+    return data
+
+
+def run_graph(extractors, task, available=None, max_workers: int = MAX_WORKERS):
+    """Run `task(ex, deps) -> {key: data}` for every extractor on a thread pool.
+
+    An extractor starts as soon as every key in its `depends_on` has been
+    produced; keys no extractor in the batch produces are taken from
+    `available` (usually the previous spec). Returns [(ex, outputs, seconds)]
+    in the order the extractors were given, whatever order they finished in.
+    """
+    available = dict(available or {})
+    producer = {}
+    for ex in extractors:
+        for key in ex.produces:
+            if key in producer:
+                raise RuntimeError(
+                    f"{key!r} produced by both {producer[key].name} and {ex.name}")
+            producer[key] = ex
+    for ex in extractors:
+        for key in ex.depends_on:
+            if key not in producer and key not in available:
+                raise RuntimeError(f"{ex.name} depends on unknown key {key!r}")
+
+    done = {}     # index -> (outputs, seconds)
+    results = {}  # key -> data, as produced in this batch
+
+    def ready(ex):
+        return all(k in results or k not in producer for k in ex.depends_on)
+
+    def timed(ex):
+        deps = {k: results[k] if k in producer else available[k] for k in ex.depends_on}
+        t0 = time.perf_counter()
+        out = task(ex, deps)
+        return out, time.perf_counter() - t0
+
+    pending = list(range(len(extractors)))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running = {}
+        while pending or running:
+            for i in [i for i in pending if ready(extractors[i])]:
+                pending.remove(i)
+                running[pool.submit(timed, extractors[i])] = i
+            if not running:
+                names = ", ".join(extractors[i].name for i in pending)
+                raise RuntimeError(f"dependency cycle between: {names}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                i = running.pop(fut)
+                out, seconds = fut.result()
+                results.update(out)
+                done[i] = (out, seconds)
+
+    return [(ex, *done[i]) for i, ex in enumerate(extractors)]
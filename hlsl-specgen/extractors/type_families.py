@@ -0,0 +1,47 @@
+# extractors/type_families.py
+# Type families: templates that stand in for fully expanded type combinatorics.
+#
+# A family is
+#   {"name": "vector",
+#    "vars": {"scalar": ["float", ...], "n": [1, 2, 3, 4]},
+#    "forms": [{"template": "{scalar}{n}", "description": "{n}-component vector of {scalar}"}]}
+# and expands to one type per form for every combination of its vars (first
+# var outermost). A var value of "@<name>" splices in the names of an earlier
+# family's expansion; var lists stay plain strings/ints so every emitter can
+# store them.
+import itertools
+
+
+def expand(families: list[dict]) -> list[dict]:
+    """All concrete {"name", "description"} types described by `families`."""
+    out, names = [], {}
+    for fam in families:
+        keys = list(fam["vars"])
+        values = [_resolve(fam["vars"][k], names) for k in keys]
+        produced = []
+        for combo in itertools.product(*values):
+            env = dict(zip(keys, combo))
+            for form in fam["forms"]:
+                name = form["template"].format(**env)
+                produced.append(name)
+                out.append({"name": name,
+                            "description": [form["description"].format(**env)]})
+        names[fam["name"]] = produced
+    return out
+
+
+def expand_types(spec: dict) -> list[dict]:
+    """spec["types"] plus the expansion of spec["type_families"] (compact specs)."""
+    return list(spec.get("types", [])) + expand(spec.get("type_families", []))
+
+
+def _resolve(values, names):
+    out = []
+    for v in values:
+        if isinstance(v, str) and v.startswith("@"):
+            if v[1:] not in names:
+                raise RuntimeError(f"type family {v[1:]!r} not defined yet")
+            out.extend(names[v[1:]])
+        else:
+            out.append(v)
+    return out
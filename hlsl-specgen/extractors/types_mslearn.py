@@ -1,15 +1,31 @@
 # extractors/types_mslearn.py
 import re
-from .base import Extractor, fetch, to_soup, dedup_by_key
+from .base import Extractor, fetch_soup, dedup_by_key, module_file, Region
+from .type_families import expand
+
+
+CONTENT = Region("div", "content")
 
 
 class TypesMSLearn(Extractor):
     name = "Types (MS Learn Scalars + String + Vectors + Matrices + Buffers)"
     target_key = "types"
+    produces = ("types", "type_families")
 
     def __init__(self,
-                 scalars_url="https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-scalar"):
+                 scalars_url="https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-scalar",
+                 compact=False):
         self.scalars_url = scalars_url
+        # compact: keep vector/matrix/buffer combinatorics as templates in
+        # "type_families" instead of expanding them into "types"
+        self.compact = compact
+
+    def urls(self):
+        return [self.scalars_url]
+
+    def sources(self):
+        return super().sources() + [module_file("extractors.type_families"),
+                                    module_file("extractors.inputs.object_types_data")]
 
     def run(self):
         # 1) scrape scalars
@@ -25,24 +41,18 @@ class TypesMSLearn(Extractor):
         if s:
             types_items.append(s)
 
-        # 3) expand vectors and matrices strictly from scalar names
-        scalar_names = [t["name"] for t in scalars]
+        # 3) vectors, matrices and buffers of them, strictly from scalar names
+        families = self._families([t["name"] for t in scalars])
+        if not self.compact:
+            types_items.extend(expand(families))
 
-        vec_items = self._expand_vectors(scalar_names)
-        types_items.extend(vec_items)
-
-        mat_items = self._expand_matrices(scalar_names)
-        types_items.extend(mat_items)
-
-        # 4) expand buffers from scalars + vectors + matrices
-        buf_items = self._expand_buffers(
-            scalar_names,
-            [v["name"] for v in vec_items],
-            [m["name"] for m in mat_items],
-        )
-        types_items.extend(buf_items)
+        # bare shorthands: vector = float4, matrix = float4x4
+        types_items.append(
+            {"name": "vector", "description": ["defaults to 4-component vector of float"]})
+        types_items.append(
+            {"name": "matrix", "description": ["defaults to 4x4 matrix of float"]})
 
-        # 5) add object/texture/sampler types from static inputs
+        # 4) add object/texture/sampler types from static inputs
         types_items.extend(self._add_object_types_from_inputs())
 
         # 5) optional generic placeholders (nice for autocomplete)
@@ -51,13 +61,15 @@ class TypesMSLearn(Extractor):
         types_items.append(
             {"name": "matrix<Type, Rows, Cols>", "description": ["generic matrix"]})
 
-        return dedup_by_key(types_items, key="name")
+        return {
+            "types": dedup_by_key(types_items, key="name"),
+            "type_families": families if self.compact else [],
+        }
 
     # ---------- scraping ----------
 
     def _extract_scalars(self):
-        html = fetch(self.scalars_url, use_cache=True)
-        soup = to_soup(html)
+        soup = fetch_soup(self.scalars_url, region=CONTENT)
 
         out = []
         for ul in soup.select("div.content ul"):
@@ -81,8 +93,7 @@ class TypesMSLearn(Extractor):
         return out
 
     def _extract_string_type(self):
-        html = fetch(self.scalars_url, use_cache=True)
-        soup = to_soup(html)
+        soup = fetch_soup(self.scalars_url, region=CONTENT)
 
         h2 = soup.find("h2", string=re.compile(r"^\s*String type\s*$", re.I))
         if not h2:
@@ -94,103 +105,51 @@ class TypesMSLearn(Extractor):
 
     # ---------- expansion ----------
 
-    def _expand_vectors(self, scalar_names):
-        out = []
+    def _families(self, scalar_names):
+        """Vector / matrix / Buffer<...> combinatorics as type family templates."""
         # exclude non-numerics and special qualifiers that aren't typical vector bases
         exclude = {"string", "snorm float", "unorm float"}
-
         base = [s for s in scalar_names if s not in exclude]
 
-        for s in base:
-            for n in range(1, 5):
-                out.append({
-                    "name": f"{s}{n}",
-                    "description": [f"{n}-component vector of {s}"]
-                })
-                out.append({
-                    "name": f"vector<{s}, {n}>",
-                    "description": [f"{n}-component vector of {s} (generic form)"]
-                })
-            out.append({
-                "name": f"vector<{s}>",
-                "description": [f"defaults to 4-component vector of {s}"]
-            })
-
-        # bare shorthand default (float4)
-        out.append({
-            "name": "vector",
-            "description": ["defaults to 4-component vector of float"]
-        })
-        return out
-
-    def _expand_matrices(self, scalar_names):
-        out = []
-        exclude = {"string", "snorm float", "unorm float"}
-
-        base = [s for s in scalar_names if s not in exclude]
-
-        for s in base:
-            for rows in range(1, 5):
-                for cols in range(1, 5):
-                    out.append({
-                        "name": f"{s}{rows}x{cols}",
-                        "description": [f"{rows}x{cols} matrix of {s}"]
-                    })
-                    out.append({
-                        "name": f"matrix<{s}, {rows}, {cols}>",
-                        "description": [f"{rows}x{cols} matrix of {s} (generic form)"]
-                    })
-            # defaults
-            out.append({
-                "name": f"matrix<{s}, 1>",
-                "description": [f"defaults to 1x4 matrix of {s}"]
-            })
-            out.append({
-                "name": f"matrix<{s}>",
-                "description": [f"defaults to 4x4 matrix of {s}"]
-            })
-
-        # bare matrix = float4x4
-        out.append({
-            "name": "matrix",
-            "description": ["defaults to 4x4 matrix of float"]
-        })
-        return out
-
-    def _expand_buffers(self, scalar_names, vector_names, matrix_names):
-        out = []
-
-        # start with scalars, excluding non-payload bases
-        exclude_scalars = {"string", "snorm float", "unorm float"}
-        bases = [s for s in scalar_names if s not in exclude_scalars]
-
-        # vectors: include concrete forms only; skip bare/generic placeholders
-        for v in vector_names:
-            if v in {"vector", "vector<Type, Components>"}:
-                continue
-            bases.append(v)
-
-        # matrices: include concrete forms only; skip bare/generic placeholders
-        for m in matrix_names:
-            if m in {"matrix", "matrix<Type, Rows, Cols>"}:
-                continue
-            bases.append(m)
-
-        # dedupe while preserving order
-        seen = set()
-        ordered_bases = []
-        for b in bases:
-            if b not in seen:
-                seen.add(b)
-                ordered_bases.append(b)
-
-        for t in ordered_bases:
-            out.append({
-                "name": f"Buffer<{t}>",
-                "description": [f"read-only buffer of {t}"]
-            })
-
-        return out
+        return [
+            {"name": "vector",
+             "vars": {"scalar": base, "n": [1, 2, 3, 4]},
+             "forms": [
+                 {"template": "{scalar}{n}",
+                  "description": "{n}-component vector of {scalar}"},
+                 {"template": "vector<{scalar}, {n}>",
+                  "description": "{n}-component vector of {scalar} (generic form)"},
+             ]},
+            {"name": "vector_default",
+             "vars": {"scalar": base},
+             "forms": [
+                 {"template": "vector<{scalar}>",
+                  "description": "defaults to 4-component vector of {scalar}"},
+             ]},
+            {"name": "matrix",
+             "vars": {"scalar": base, "rows": [1, 2, 3, 4], "cols": [1, 2, 3, 4]},
+             "forms": [
+                 {"template": "{scalar}{rows}x{cols}",
+                  "description": "{rows}x{cols} matrix of {scalar}"},
+                 {"template": "matrix<{scalar}, {rows}, {cols}>",
+                  "description": "{rows}x{cols} matrix of {scalar} (generic form)"},
+             ]},
+            {"name": "matrix_default",
+             "vars": {"scalar": base},
+             "forms": [
+                 {"template": "matrix<{scalar}, 1>",
+                  "description": "defaults to 1x4 matrix of {scalar}"},
+                 {"template": "matrix<{scalar}>",
+                  "description": "defaults to 4x4 matrix of {scalar}"},
+             ]},
+            # buffers of every scalar, vector and matrix (concrete forms only)
+            {"name": "buffer",
+             "vars": {"t": base + [f"@{f}" for f in
+                                   ("vector", "vector_default", "matrix", "matrix_default")]},
+             "forms": [
+                 {"template": "Buffer<{t}>", "description": "read-only buffer of {t}"},
+             ]},
+        ]
 
     def _add_object_types_from_inputs(self, module_path: str = "extractors.inputs.object_types_data", attr: str = "TYPES"):
         """Load static HLSL object/texture/sampler types from the inputs module."""
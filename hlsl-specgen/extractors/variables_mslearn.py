@@ -1,25 +1,81 @@
 # extractors/variables_mslearn.py
 import re
-from .base import Extractor, fetch, to_soup, dedup_by_key
+from .base import Extractor, fetch_soup, dedup_by_key, read_table, Region
 
+# "COLOR[n]", or "SV_Target[n], where 0 <= n <= 7" with the range spelled out
 FAMILY_RE = re.compile(
-    r"^(?P<base>[A-Za-z_][A-Za-z0-9_]*?)\s*\[\s*n\s*\]\s*$", re.I)
+    r"^(?P<base>[A-Za-z_][A-Za-z0-9_]*?)\s*\[\s*n\s*\]"
+    r"(?:\s*,\s*where\s+(?P<min>\d+)\s*<=\s*n\s*<=\s*(?P<max>\d+))?\s*$", re.I)
 IS_SV = re.compile(r"^\s*SV_", re.I)
+INDEXED = re.compile(r"^(?P<base>.*?)(?P<n>\d+)$")
+# semantic_index["stages"] keys; "system" holds every SV_ semantic, which is
+# also listed under each stage it is valid in
+STAGES = ("vs_in", "vs_out", "ps_in", "ps_out", "system")
+# where the page lists a system value only in its own table, the stages it is
+# valid in (D3D10+ semantics); compute/tessellation-only ones stay in "system"
+SV_STAGES = {k.lower(): v for k, v in {
+    "SV_Barycentrics": ("ps_in",),
+    "SV_ClipDistance": ("vs_out", "ps_in"),
+    "SV_Coverage": ("ps_in", "ps_out"),
+    "SV_CullDistance": ("vs_out", "ps_in"),
+    "SV_Depth": ("ps_out",),
+    "SV_DepthGreaterEqual": ("ps_out",),
+    "SV_DepthLessEqual": ("ps_out",),
+    "SV_InnerCoverage": ("ps_in",),
+    "SV_InstanceID": ("vs_in",),
+    "SV_IsFrontFace": ("ps_in",),
+    "SV_Position": ("vs_out", "ps_in"),
+    "SV_PrimitiveID": ("ps_in",),
+    "SV_RenderTargetArrayIndex": ("ps_in",),
+    "SV_SampleIndex": ("ps_in",),
+    "SV_ShadingRate": ("ps_in",),
+    "SV_StencilRef": ("ps_out",),
+    "SV_Target": ("ps_out",),
+    "SV_VertexID": ("vs_in",),
+    "SV_ViewID": ("vs_in", "ps_in"),
+    "SV_ViewportArrayIndex": ("ps_in",),
+}.items()}
+
+
+def find_semantic(index: dict, stage: str, name: str) -> dict | None:
+    """The semantic_index record for `name` (e.g. "COLOR3") in `stage`, or None.
+
+    Exact names are one dict lookup; otherwise a name falls back to its
+    family ("COLOR[n]") when its index (0 if it has none, as in HLSL) is
+    inside the family's range.
+    """
+    names = index["stages"].get(stage, {})
+    i = names.get(name)
+    if i is None:
+        m = INDEXED.match(name)
+        base, n = (m.group("base"), int(m.group("n"))) if m else (name, 0)
+        fam = index["families"].get(base)
+        if fam and fam["min"] <= n <= fam["max"]:
+            i = names.get(index["semantics"][fam["semantic"]]["name"])
+    return None if i is None else index["semantics"][i]
 
 
 class VariablesMSLearn(Extractor):
     name = "Variables (MS Learn tables: VS/PS + SV)"
     target_key = "variables"
+    produces = ("variables", "semantic_index")
 
     def __init__(self,
                  url="https://learn.microsoft.com/en-us/windows/win32/direct3dhlsl/dx-graphics-hlsl-semantics",
-                 expand_range=(0, 7)):
+                 expand_range=(0, 7),
+                 compact=False):
         self.url = url
         self.expand_lo, self.expand_hi = expand_range  # inclusive
+        # compact: list families like COLOR[n] once; "semantic_index" carries
+        # their index range instead of COLOR0..COLOR7 copies in "variables"
+        self.compact = compact
+
+    def urls(self):
+        return [self.url]
 
     def run(self):
-        html = fetch(self.url, use_cache=True)
-        soup = to_soup(html)
+        # VS in/out, PS in/out and system-value tables; skip the rest of the page
+        soup = fetch_soup(self.url, region=Region("div", "content", tables=5))
 
         tables = soup.select("div.content table")
         if len(tables) < 5:
@@ -28,6 +84,8 @@ class VariablesMSLearn(Extractor):
 
         role_labels = ["vs_in", "vs_out", "ps_in", "ps_out"]
         items_by_name = {}
+        listed_in = {}  # name -> stage tables it appears in (SV_ ones too)
+        ranges = {}  # family -> (min, max) where the page spells it out
 
         # First four tables: aggregate modifiers
         for idx in range(4):
@@ -36,6 +94,8 @@ class VariablesMSLearn(Extractor):
                 name, desc, typ = row["name"], row["desc"], row.get("type", "")
                 if not name:
                     continue
+                if row["range"]:
+                    ranges[name] = row["range"]
 
                 entry = items_by_name.get(name) or {
                     "name": name,
@@ -50,6 +110,7 @@ class VariablesMSLearn(Extractor):
                 if not IS_SV.match(name):
                     entry["modifiers"].add(role)
                 items_by_name[name] = entry
+                listed_in.setdefault(name, set()).add(role)
 
                 # Family NAME[n]
                 fam = self._family_key(name)
@@ -66,12 +127,15 @@ class VariablesMSLearn(Extractor):
                         fentry["type"] = typ
                     fentry["modifiers"].add(role)
                     items_by_name[fam] = fentry
+                    listed_in.setdefault(fam, set()).add(role)
 
         # Fifth table: system value semantics; leave modifiers empty
         for row in self._rows(tables[4]):
             name, desc, typ = row["name"], row["desc"], row.get("type", "")
             if not name:
                 continue
+            if row["range"]:
+                ranges[name] = row["range"]
             entry = items_by_name.get(name) or {
                 "name": name,
                 "description": "",
@@ -83,14 +147,17 @@ class VariablesMSLearn(Extractor):
                 entry["type"] = typ
             items_by_name[name] = entry
 
+        index = self._index(items_by_name, listed_in, ranges)
+
         # Expand families like COLOR[n] -> COLOR0..COLOR7
         expanded = {}
-        for key, entry in list(items_by_name.items()):
+        for key, entry in ([] if self.compact else list(items_by_name.items())):
             m = FAMILY_RE.match(key)
             if not m:
                 continue
             base = m.group("base")
-            for i in range(self.expand_lo, self.expand_hi + 1):
+            lo, hi = ranges.get(key, (self.expand_lo, self.expand_hi))
+            for i in range(lo, hi + 1):
                 concrete = f"{base}{i}"
                 centry = items_by_name.get(concrete) or {
                     "name": concrete,
@@ -113,21 +180,51 @@ class VariablesMSLearn(Extractor):
             })
 
         out.sort(key=lambda x: x["name"].lower())
-        return dedup_by_key(out, key="name")
+        return {"variables": dedup_by_key(out, key="name"), "semantic_index": index}
+
+    def _index(self, items_by_name, listed_in, ranges):
+        """Stage-keyed lookup tables over the unexpanded semantics:
+        {"semantics": [{name, type, description}],
+         "families": {base: {"semantic": i, "min", "max"}},
+         "stages": {stage: {name: i}}}, i indexing "semantics"."""
+        semantics, families = [], {}
+        stages = {stage: {} for stage in STAGES}
+        for i, name in enumerate(sorted(items_by_name, key=lambda n: (n.lower(), n))):
+            e = items_by_name[name]
+            semantics.append({"name": name, "type": e["type"],
+                              "description": e["description"]})
+            m = FAMILY_RE.match(name)
+            if m:
+                lo, hi = ranges.get(name, (self.expand_lo, self.expand_hi))
+                families[m.group("base")] = {"semantic": i, "min": lo, "max": hi}
+            for stage in self._stages(name, e["modifiers"] | listed_in.get(name, set())):
+                stages[stage][name] = i
+        return {"semantics": semantics, "families": families, "stages": stages}
+
+    def _stages(self, name: str, listed) -> list[str]:
+        """semantic_index stages of `name`, given the stage tables it is listed in."""
+        if not IS_SV.match(name):
+            return sorted(listed) or ["system"]
+        m = FAMILY_RE.match(name)
+        known = SV_STAGES.get((m.group("base") if m else name).strip().lower(), ())
+        return sorted(set(listed) | set(known)) + ["system"]
 
     # ---------- helpers ----------
 
     def _rows(self, table):
-        rows = []
-        for tr in table.find_all("tr"):
-            cells = tr.find_all(["td", "th"])
-            if len(cells) < 2:
-                continue
-            name = cells[0].get_text(" ", strip=True)
-            desc = cells[1].get_text(" ", strip=True)
-            typ = cells[2].get_text(" ", strip=True) if len(cells) >= 3 else ""
-            rows.append({"name": name, "desc": desc, "type": typ})
-        return rows
+        # semantic | description | type; header rows are not semantics
+        t = read_table(table, min_cells=2)
+        return [{**self._normalize(name), "desc": desc, "type": typ}
+                for name, desc, typ in zip(t.column(0), t.column(1), t.column(2))]
+
+    def _normalize(self, name: str) -> dict:
+        """{"name", "range"}: "SV_Target[n], where 0 <= n <= 7" becomes
+        "SV_Target[n]" with range (0, 7); other names pass through."""
+        m = FAMILY_RE.match(name)
+        if not m or m.group("min") is None:
+            return {"name": name, "range": None}
+        return {"name": f"{m.group('base')}[n]",
+                "range": (int(m.group("min")), int(m.group("max")))}
 
     def _family_key(self, name: str):
         m = FAMILY_RE.match(name)
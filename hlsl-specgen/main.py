@@ -1,56 +1,282 @@
+import argparse
+import copy
+import cProfile
 import json
+import os
 import pathlib
-from extractors.keywords_mslearn import KeywordsMSLearn
-from extractors.base import merge_into, ensure_dir
-from extractors.operators_inputs import OperatorsIn
-from extractors.types_mslearn import TypesMSLearn
-from extractors.variables_mslearn import VariablesMSLearn
-from extractors.functions_mslearn import FunctionsMSLearn
+import sys
+from extractors import base, metrics, registry
+from extractors.base import (fetch_many, write_if_changed,
+                             use_fixtures, set_parser, cache_store)
+from extractors.merge import SpecMerger, REPLACE, record
+from extractors.parsing import BACKENDS
+from extractors.scheduler import run_graph, outputs
+from emitters import (availability, binary_spec, delta, docs, prefix_index, shards,
+                      stream_json, symbols)
 
 OUT = pathlib.Path("out/spec.json")
+OUT_BIN = pathlib.Path("out/spec.bin")
+OUT_INDEX = pathlib.Path("out/prefix_index.json")
+OUT_SYMBOLS = pathlib.Path("out/symbols.json")
+OUT_PROFILES = pathlib.Path("out/profiles.json")
+OUT_DELTAS = pathlib.Path("out/deltas")
+OUT_SHARDS = pathlib.Path("out/spec")
+MANIFEST = pathlib.Path("out/build_manifest.json")
+REPORT = pathlib.Path("out/run_report.json")
 
 FRESH = {
     "comment": "generated from Microsoft Learn",
-    "keywords": [], "types": [], "functions": [], "operators": [], "variables": [],
+    "keywords": [], "types": [], "type_families": [], "functions": [], "operators": [],
+    "variables": [], "semantic_index": {},
 }
 
+# named-entry categories merged into the existing spec so hand-curated fields and
+# entries survive a regeneration; everything else is replaced wholesale
+MERGED = {"keywords", "types", "functions", "operators", "variables"}
+# kept ordered by name; types and operators keep their generation order
+SORTED = {"keywords", "functions", "variables"}
+
 
 def load_spec(path: pathlib.Path) -> dict:
     if not path.exists() or path.stat().st_size == 0:
-        return dict(FRESH)  # fresh copy
+        return copy.deepcopy(FRESH)  # extractors fill its lists in place
     try:
         return json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
         # file exists but is garbage → don’t die
-        return dict(FRESH)
+        return copy.deepcopy(FRESH)
 
 
-def save_spec(path: pathlib.Path, spec: dict):
-    ensure_dir(path.parent)
-    path.write_text(json.dumps(
-        spec, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def save_spec(path: pathlib.Path, spec: dict) -> bool:
+    """Stream `spec` out atomically unless the file already holds the same bytes;
+    returns whether it wrote."""
+    return stream_json.write_spec(path, spec)
 
 
-def main():
+def save_binary_spec(path: pathlib.Path, spec: dict) -> bool:
+    # round-tripping is covered by tests/test_binary_spec.py, not paid per run
+    return write_if_changed(path, binary_spec.encode(spec))
+
+
+def load_manifest(path: pathlib.Path) -> dict:
+    """{"fingerprints": {extractor name: input fingerprint},
+    "generated": {category: {entry name: {field: value hash}}}} from the previous
+    run: what the generator produced, so merges can tell hand edits from it."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+    if not isinstance(manifest.get("fingerprints"), dict):
+        manifest = {}  # missing or pre-merge layout: rerun everything once
+    manifest.setdefault("fingerprints", {})
+    manifest.setdefault("generated", {})
+    return manifest
+
+
+def build_extractors(compact_types: bool = False, names=None,
+                     compact_semantics: bool = False) -> list:
+    """The selected extractors (all by default), imported on demand."""
+    return registry.create(names, options={"types": {"compact": compact_types},
+                                           "variables": {"compact": compact_semantics}})
+
+
+COMMANDS = ("run", "list")
+
+
+def parse_args(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv.insert(0, "run")  # `main.py [flags]` still means a full run
+
+    root = argparse.ArgumentParser(description="Generate out/spec.json")
+    sub = root.add_subparsers(dest="command", metavar="{run,list}")
+    sub.add_parser("list", help="list the registered extractors")
+    ap = sub.add_parser("run", help="run extractors (default command)")
+    ap.add_argument("names", nargs="*", metavar="NAME",
+                    help=f"extractors to run: {', '.join(registry.REGISTRY)} (default: all); "
+                         "the rest of the spec is kept as is")
+    ap.add_argument("--force", action="store_true",
+                    help="rerun every extractor even if its inputs are unchanged")
+    ap.add_argument("--compact-types", action="store_true",
+                    help="store vector/matrix/buffer types as templates in type_families")
+    ap.add_argument("--compact-semantics", action="store_true",
+                    help="list semantic families like COLOR[n] once instead of COLOR0..COLOR7 "
+                         "(their ranges are in semantic_index)")
+    ap.add_argument("--fixtures", metavar="DIR",
+                    help="replay every page from a recorded corpus (no network)")
+    ap.add_argument("--record", metavar="DIR",
+                    help="snapshot every fetched page into a corpus")
+    ap.add_argument("--origin", metavar="URL",
+                    help="send requests to a stand-in server, e.g. http://127.0.0.1:8000")
+    ap.add_argument("--shards", action="store_true",
+                    help=f"also write one file per category to {OUT_SHARDS}/ with a manifest")
+    ap.add_argument("--parser", choices=BACKENDS, default=BACKENDS[0],
+                    help="HTML parser backend (default: %(default)s)")
+    ap.add_argument("--cache-budget", type=int, metavar="MB",
+                    default=base.CACHE_BUDGET // (1024 * 1024),
+                    help="compressed page cache size before LRU eviction (default: %(default)s)")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="extractors to run concurrently")
+    ap.add_argument("--report", metavar="FILE", default=str(REPORT),
+                    help="where to write the run report (default: %(default)s)")
+    ap.add_argument("--profile", metavar="DIR",
+                    help="dump a cProfile of each extractor's run() to DIR/<name>.prof "
+                         "(runs extractors one at a time)")
+    ap.add_argument("--trace", metavar="FILE",
+                    help="write timing spans as Chrome trace events (chrome://tracing, Perfetto)")
+    args = root.parse_args(argv)
+    unknown = [n for n in getattr(args, "names", []) if n not in registry.REGISTRY]
+    if unknown:
+        ap.error(f"unknown extractor(s) {', '.join(unknown)}; "
+                 f"choose from {', '.join(registry.REGISTRY)}")
+    return args
+
+
+def list_extractors():
+    """Registry listing; imports nothing but the registry."""
+    width = max(map(len, registry.REGISTRY))
+    for name, target in registry.REGISTRY.items():
+        source = "local" if name in registry.LOCAL else "network"
+        print(f"{name:<{width}}  {source:<7}  {target}")
+
+
+def run(args):
+    metrics.reset()
     spec = load_spec(OUT)
+    manifest = load_manifest(MANIFEST)
+    if spec == FRESH:
+        # spec.json is missing or unreadable: a skipped extractor would hand back
+        # FRESH's empty lists, so its fingerprint no longer vouches for anything
+        manifest["fingerprints"].clear()
+    set_parser(args.parser)  # also clears the document cache
+    base.CACHE_BUDGET = args.cache_budget * 1024 * 1024
+    if args.fixtures or args.record:
+        from extractors.fixtures import Corpus  # pulls in http.server
+        use_fixtures(replay=Corpus(args.fixtures) if args.fixtures else None,
+                     record=Corpus(args.record) if args.record else None,
+                     origin=args.origin)
+    else:
+        use_fixtures(origin=args.origin)
+
+    selected = registry.select(args.names)
+    extractors = build_extractors(compact_types=args.compact_types, names=selected,
+                                  compact_semantics=args.compact_semantics)
+    slugs = {ex.name: n for ex, n in zip(extractors, selected)}
 
-    extractors = [
-        KeywordsMSLearn(),
-        OperatorsIn(),
-        TypesMSLearn(),
-        VariablesMSLearn(),
-        FunctionsMSLearn(),
-    ]
+    # warm the page cache concurrently; extractors then read from disk
+    urls = [u for ex in extractors for u in ex.urls()]
+    print(f"[fetch] {len(urls)} pages")
+    with metrics.span("fetch_many", "fetch"):
+        pages, failed = fetch_many(urls)
+    for url, error in failed.items():
+        print(f"[warn] fetch failed for {url}: {error}")
+    fingerprints = {}
+    ran = []
 
-    for ex in extractors:
+    def task(ex, deps):
+        with metrics.span(slugs[ex.name], "fingerprint"):
+            fp = fingerprints[ex.name] = ex.fingerprint(pages, deps, failed)
+        if (not args.force and manifest["fingerprints"].get(ex.name) == fp
+                and all(k in spec for k in ex.produces)):
+            print(f"[skip] {ex.name} (inputs unchanged)")
+            return {k: spec[k] for k in ex.produces}
         print(f"[run] {ex.name}")
-        data = ex.run()
-        # if (ex.name == "Types (MS Learn Scalars)"):
-        # print(data)
-        spec[ex.target_key] = data
+        ran.append(slugs[ex.name])
+        with metrics.span(slugs[ex.name], "extract"):
+            if not args.profile:
+                return outputs(ex, ex.run(**deps))
+            prof = cProfile.Profile()
+            try:
+                return outputs(ex, prof.runcall(ex.run, **deps))
+            finally:
+                path = pathlib.Path(args.profile) / f"{slugs[ex.name]}.prof"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                prof.dump_stats(path)
+
+    # independent extractors run concurrently; results merge in list order.
+    # cProfile only sees its own thread, so profiling runs them one at a time
+    jobs = 1 if args.profile else args.jobs
+    merger = SpecMerger(spec, default=REPLACE, sort=SORTED)
+    for ex, data, seconds in run_graph(extractors, task, available=spec, max_workers=jobs):
+        print(f"[time] {ex.name}: {seconds:.2f}s")
+        for key, value in data.items():
+            if value is spec.get(key):
+                continue  # skipped extractor handed back what is already there
+            with metrics.span(key, "merge"):
+                if key in MERGED:
+                    generated = manifest["generated"].get(key)
+                    if generated is not None:
+                        names = list(generated)
+                    else:
+                        # no record (older manifest): only entry names may be known;
+                        # without either, runs overwrote whole categories, so
+                        # everything in the spec was generated
+                        names = manifest.get("names", {}).get(key)
+                        if names is None:
+                            names = [x.get("name") for x in spec.get(key, [])]
+                    counts = merger.merge(key, value, remove=names, generated=generated)
+                    manifest["generated"][key] = record(value)
+                    print(f"[merge] {key}: " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+                else:
+                    spec[key] = value
+        manifest["fingerprints"][ex.name] = fingerprints[ex.name]
 
-    save_spec(OUT, spec)
-    print(f"[ok] wrote {OUT}")
+    # resolve keyword/type collisions once, here, instead of in every consumer
+    with metrics.span("symbols", "annotate"):
+        symbols.annotate(spec)
+    # hover/completion strings, prebuilt so the server does no formatting at startup
+    with metrics.span("docs", "annotate"):
+        docs.annotate(spec)
+    # shader-model/stage bitsets: profile filtering is an AND per entry
+    with metrics.span("availability", "annotate"):
+        bits = availability.annotate(spec)
+
+    with metrics.span("spec.json", "save"):
+        previous = load_spec(OUT)  # still the last generation's file
+        wrote = save_spec(OUT, spec)
+    print(f"[ok] wrote {OUT}" if wrote else f"[ok] {OUT} unchanged")
+    with metrics.span("delta", "save"):
+        path = delta.write_delta(OUT_DELTAS, previous, spec) if wrote else None
+    if path:
+        print(f"[ok] wrote {path}")
+    with metrics.span("spec.bin", "save"):
+        if save_binary_spec(OUT_BIN, spec):
+            print(f"[ok] wrote {OUT_BIN}")
+    with metrics.span("prefix_index", "save"):
+        if write_if_changed(OUT_INDEX, prefix_index.encode(spec)):
+            print(f"[ok] wrote {OUT_INDEX}")
+    with metrics.span("symbols", "save"):
+        if write_if_changed(OUT_SYMBOLS, symbols.encode(spec)):
+            print(f"[ok] wrote {OUT_SYMBOLS}")
+    with metrics.span("profiles", "save"):
+        if write_if_changed(OUT_PROFILES, availability.encode(spec, bits)):
+            print(f"[ok] wrote {OUT_PROFILES}")
+    if args.shards:
+        with metrics.span("shards", "save"):
+            changed = shards.write_shards(OUT_SHARDS, spec)
+        print(f"[ok] {OUT_SHARDS}: {', '.join(changed) or 'no shards'} changed")
+    manifest.pop("names", None)  # superseded by "generated"
+    save_spec(MANIFEST, manifest)
+    if urls:
+        cache_store().flush()
+
+    report = {"extractors": selected, "ran": ran, "parser": args.parser,
+              "jobs": jobs, **metrics.report()}
+    write_if_changed(pathlib.Path(args.report),
+                     json.dumps(report, indent=2).encode("utf-8"))
+    print(f"[ok] {args.report}: " + ", ".join(
+        f"{k} {v:.2f}s" for k, v in report["stages"].items()))
+    if args.trace:
+        write_if_changed(pathlib.Path(args.trace),
+                         json.dumps(metrics.trace_events()).encode("utf-8"))
+
+
+def main():
+    args = parse_args()
+    if args.command == "list":
+        list_extractors()
+    else:
+        run(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+# tests/test_availability.py
+# Stage bits of semantics follow the stage tables they are listed in.
+from emitters.availability import annotate, available
+
+INDEX = {
+    "semantics": [{"name": "COLOR[n]"}, {"name": "SV_Depth"},
+                  {"name": "SV_DispatchThreadID"}, {"name": "SV_Target[n]"}],
+    "families": {"COLOR": {"semantic": 0, "min": 0, "max": 7},
+                 "SV_Target": {"semantic": 3, "min": 0, "max": 7}},
+    "stages": {"vs_in": {"COLOR[n]": 0}, "vs_out": {}, "ps_in": {},
+               "ps_out": {"SV_Depth": 1, "SV_Target[n]": 3},
+               "system": {"SV_Depth": 1, "SV_DispatchThreadID": 2, "SV_Target[n]": 3}},
+}
+
+
+def profiles(spec, name):
+    bits = annotate(spec)
+    mask = next(v for v in spec["variables"] if v["name"] == name)["availability"]
+    return {p for p, m in bits.profiles().items() if available(mask, m)}
+
+
+def spec():
+    return {"variables": [{"name": n, "modifiers": []} for n in
+                          ("SV_Depth", "SV_DispatchThreadID", "SV_Target3")]
+            + [{"name": "COLOR0", "modifiers": ["vs_in"]}],
+            "semantic_index": INDEX}
+
+
+def test_sv_semantic_only_in_its_stages():
+    ok = profiles(spec(), "SV_Depth")
+    assert "ps_5_0" in ok and "vs_5_0" not in ok and "ps_3_0" not in ok
+    ok = profiles(spec(), "SV_Target3")
+    assert "ps_4_0" in ok and "cs_5_0" not in ok
+
+
+def test_system_only_semantic_in_every_stage():
+    ok = profiles(spec(), "SV_DispatchThreadID")
+    assert {"cs_5_0", "vs_5_0"} <= ok and "cs_4_0" in ok and "vs_3_0" not in ok
+
+
+def test_index_semantics_annotated():
+    s = spec()
+    bits = annotate(s)
+    depth = s["semantic_index"]["semantics"][1]["availability"]
+    assert not available(depth, bits.profiles()["vs_5_0"])
+    assert available(s["semantic_index"]["semantics"][0]["availability"],
+                     bits.profiles()["vs_2_0"])
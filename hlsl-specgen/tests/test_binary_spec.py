@@ -0,0 +1,61 @@
+# tests/test_binary_spec.py
+# HLSB round trips against the JSON it encodes. Run from hlsl-specgen/:
+#   python -m pytest tests
+import json
+import pathlib
+
+import pytest
+
+from emitters import binary_spec
+
+SPEC = pathlib.Path(__file__).resolve().parent.parent / "out" / "spec.json"
+
+
+def roundtrip(spec: dict) -> dict:
+    data = binary_spec.encode(spec)
+    binary_spec.verify_roundtrip(spec, data)
+    return binary_spec.BinarySpec(data).to_dict()
+
+
+def test_generated_spec():
+    spec = json.loads(SPEC.read_text(encoding="utf-8"))
+    assert roundtrip(spec) == spec
+
+
+def test_null_and_missing_fields_stay_distinct():
+    spec = {"functions": [{"name": "a", "notes": None, "n": None},
+                          {"name": "b", "n": 3},
+                          {"name": "c", "notes": None}],
+            "comment": None}
+    back = roundtrip(spec)
+    assert back == spec
+    assert "notes" not in back["functions"][1] and "n" not in back["functions"][2]
+
+
+def test_floats():
+    spec = {"types": [{"name": "a", "size": 1.5}, {"name": "b", "size": -0.25}],
+            "ratio": 0.1, "big": 1e300}
+    data = binary_spec.encode(spec)
+    table = binary_spec.BinarySpec(data).tables
+    assert dict(table["types"].fields)["size"] == binary_spec.F32
+    assert dict(table["spec"].fields)["ratio"] == binary_spec.F64
+    assert roundtrip(spec) == spec
+
+
+def test_int_range():
+    assert roundtrip({"lo": -0x7FFFFFFE, "hi": 0x7FFFFFFF}) == {"lo": -0x7FFFFFFE, "hi": 0x7FFFFFFF}
+    with pytest.raises(RuntimeError):
+        binary_spec.encode({"lo": -0x7FFFFFFF})
+
+
+def test_mixed_kinds_are_rejected():
+    with pytest.raises(RuntimeError, match="mixed value kinds"):
+        binary_spec.encode({"functions": [{"name": "a", "x": 1}, {"name": "b", "x": "1"}]})
+    with pytest.raises(RuntimeError, match="cannot encode"):
+        binary_spec.encode({"x": float("nan")})
+
+
+def test_key_order_does_not_change_the_bytes():
+    a = {"keywords": [{"name": "if", "kind": "hlsl"}], "comment": "x"}
+    b = {"comment": "x", "keywords": [{"kind": "hlsl", "name": "if"}]}
+    assert binary_spec.encode(a) == binary_spec.encode(b)
@@ -0,0 +1,21 @@
+# tests/test_docs.py
+# Prebuilt hover text: what the server would otherwise format at startup.
+from emitters import docs
+
+
+def test_every_type_documented():
+    spec = {"types": [{"name": "float", "description": ["32-bit float."]},
+                      {"name": "half", "description": ["16-bit float.", "Maps to float."]},
+                      {"name": "bare"}]}
+    docs.annotate(spec)
+    assert [t["documentation"] for t in spec["types"]] == [
+        "32-bit float.", "16-bit float.\n\nMaps to float.", ""]
+
+
+def test_stage_roles_not_in_signature():
+    var = {"name": "COLOR0", "type": "float4",
+           "modifiers": ["ps_in", "ps_out", "vs_in", "vs_out"]}
+    assert docs.variable_signature(var, names=False) == "float4"
+    assert docs.variable_signature(var, names=True) == "float4 COLOR0;"
+    var["modifiers"] = ["uniform", "vs_in"]
+    assert docs.variable_signature(var, names=True) == "uniform float4 COLOR0;"
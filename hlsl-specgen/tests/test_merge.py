@@ -0,0 +1,58 @@
+# tests/test_merge.py
+# SpecMerger: hand edits survive regeneration, upstream edits land.
+import copy
+
+from extractors.merge import REPLACE, SpecMerger, record
+from main import SORTED
+
+
+def generate(spec, items, generated, key="functions"):
+    """One run: merge `items` and return the record for the next one."""
+    SpecMerger(spec, default=REPLACE, sort=SORTED).merge(
+        key, copy.deepcopy(items), remove=list(generated), generated=generated)
+    return record(items)
+
+
+SCRAPED = [{"name": "abs", "description": "Absolute value (per component)."},
+           {"name": "clip", "description": "Discards the current pixel."}]
+
+
+def test_curated_edit_survives():
+    spec = {"functions": []}
+    gen = generate(spec, SCRAPED, {})
+    spec["functions"][0]["description"] = "Curated."
+    generate(spec, SCRAPED, gen)
+    assert spec["functions"][0]["description"] == "Curated."
+
+
+def test_upstream_edit_lands():
+    spec = {"functions": []}
+    gen = generate(spec, SCRAPED, {})
+    updated = copy.deepcopy(SCRAPED)
+    updated[0]["description"] = "Absolute value."
+    gen = generate(spec, updated, gen)
+    assert spec["functions"][0]["description"] == "Absolute value."
+    # ...and a curated edit made after that still wins over the next upstream one
+    spec["functions"][1]["description"] = "Curated."
+    updated[1]["description"] = "Discards the pixel."
+    generate(spec, updated, gen)
+    assert spec["functions"][1]["description"] == "Curated."
+
+
+def test_stale_generated_entries_go_hand_added_stay():
+    spec = {"functions": []}
+    gen = generate(spec, SCRAPED, {})
+    spec["functions"].append({"name": "mine", "description": "Hand-added."})
+    generate(spec, SCRAPED[:1], gen)
+    assert [f["name"] for f in spec["functions"]] == ["abs", "mine"]
+
+
+def test_unsorted_order_follows_generator():
+    # "types" is unsorted: it keeps the generator's order; an earlier, shorter run must not
+    # leave its order behind
+    items = [{"name": n} for n in ("float4", "int", "bool")]
+    spec = {"types": []}
+    gen = generate(spec, items[2:], {}, key="types")
+    spec["types"].append({"name": "mytype"})
+    generate(spec, items, gen, key="types")
+    assert [t["name"] for t in spec["types"]] == ["float4", "int", "bool", "mytype"]
@@ -0,0 +1,44 @@
+# tests/test_semantics.py
+# VariablesMSLearn: family names as the semantics page spells them.
+from bench.corpus import page, table
+from extractors import base
+from extractors.fixtures import Corpus
+from extractors.variables_mslearn import VariablesMSLearn, find_semantic
+
+HEAD = ("Semantic", "Description", "Type")
+
+
+def scrape(tmp_path, system_rows):
+    ex = VariablesMSLearn()
+    corpus = Corpus(tmp_path)
+    corpus.put(ex.url, page(
+        table(HEAD, [("COLOR[n]", "Diffuse color", "float4")]) * 4
+        + table(HEAD, system_rows)))
+    base.use_fixtures(replay=corpus)
+    base.clear_doc_cache()
+    try:
+        return ex.run()
+    finally:
+        base.use_fixtures()
+
+
+def test_where_clause_names_a_family(tmp_path):
+    out = scrape(tmp_path, [("SV_Target[n], where 0 <= n <= 7",
+                             "The output value that will be stored in a render target.",
+                             "float[2|3|4]")])
+    ix = out["semantic_index"]
+    assert ix["families"]["SV_Target"]["max"] == 7
+    assert find_semantic(ix, "ps_out", "SV_Target0")["name"] == "SV_Target[n]"
+    assert find_semantic(ix, "ps_out", "SV_Target7") is not None
+    assert find_semantic(ix, "ps_out", "SV_Target8") is None
+    assert find_semantic(ix, "vs_out", "SV_Target0") is None
+    names = {v["name"] for v in out["variables"]}
+    assert {"SV_Target[n]", "SV_Target0", "SV_Target7"} <= names
+
+
+def test_where_clause_range_is_used(tmp_path):
+    out = scrape(tmp_path, [("SV_ClipDistance[n], where 0 <= n <= 1", "Clip distance", "float")])
+    ix = out["semantic_index"]
+    assert find_semantic(ix, "vs_out", "SV_ClipDistance1") is not None
+    assert find_semantic(ix, "vs_out", "SV_ClipDistance2") is None
+    assert "SV_ClipDistance2" not in {v["name"] for v in out["variables"]}
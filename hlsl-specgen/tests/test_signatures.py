@@ -0,0 +1,26 @@
+# tests/test_signatures.py
+# FunctionsMSLearn: signatures as the intrinsic detail pages write them.
+from bench.corpus import page, table
+from extractors.functions_mslearn import FunctionsMSLearn
+
+ABS = page(
+    "<h2 id='syntax'>Syntax</h2><pre><code>ret abs(\n  in x\n);</code></pre>"
+    "<h2 id='parameters'>Parameters</h2>"
+    + table(["Item", "Description"], [("x [in]", "The specified value.")])
+    + "<h2 id='type-description'>Type Description</h2>"
+    + table(["Name", "Template Type", "Component Type", "Size"],
+            [("x", "scalar, vector, or matrix", "float, int", "any"),
+             ("ret", "same as input x", "float, int", "same dimension(s) as input x")]))
+
+
+def test_placeholders_resolve_through_type_table():
+    sig = FunctionsMSLearn()._parse_signature(ABS)
+    assert sig["return_type"] == "same as input x"
+    assert sig["parameters"] == [{"name": "x", "type": "scalar, vector, or matrix",
+                                  "modifiers": ["in"], "optional": False,
+                                  "description": "The specified value."}]
+
+
+def test_concrete_return_type_kept():
+    sig = FunctionsMSLearn()._parse_signature(ABS.replace("ret abs", "float abs"))
+    assert sig["return_type"] == "float"
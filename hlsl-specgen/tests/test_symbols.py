@@ -0,0 +1,15 @@
+# tests/test_symbols.py
+# The symbol table and the prefix index list the same names.
+from emitters import prefix_index, symbols
+
+SPEC = {"types": [{"name": "bool"}],
+        "keywords": [{"name": "bool"}],
+        "type_families": [{"name": "vector", "vars": {"scalar": ["float"], "n": [4]},
+                           "forms": [{"template": "{scalar}{n}", "description": "x"}]}]}
+
+
+def test_compact_type_families_expanded():
+    table = {s["name"]: s["categories"] for s in symbols.build(SPEC)["symbols"]}
+    assert table == {"bool": ["keyword", "type"], "float4": ["type"]}
+    names = {name for name, _ in prefix_index.build(SPEC)["entries"]}
+    assert names == set(table)